@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# coding : utf-8
+
+"""
+Generate synthetic RVTools-like .xlsx workbooks (every tab and column read
+by pyrvtools), the sheets are streamed to the archive row by row
+
+usage: python -m benchmarks.generate OUTPUT.xlsx --vms 10000
+"""
+
+import argparse
+import random
+import zipfile
+from datetime import datetime, timedelta
+from xml.sax.saxutils import escape
+from pyrvtools.schema import DATE_FORMAT, SHEETS
+
+NS_MAIN = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+NS_REL = ('http://schemas.openxmlformats.org/officeDocument/2006/'
+          'relationships')
+NS_PKG_REL = 'http://schemas.openxmlformats.org/package/2006/relationships'
+SHEET_TYPE = ('application/vnd.openxmlformats-officedocument.'
+              'spreadsheetml.worksheet+xml')
+WORKBOOK_TYPE = ('application/vnd.openxmlformats-officedocument.'
+                 'spreadsheetml.sheet.main+xml')
+
+OPERATING_SYSTEMS = ('Microsoft Windows Server 2019 (64-bit)',
+                     'Red Hat Enterprise Linux 8 (64-bit)',
+                     'Ubuntu Linux (64-bit)', 'CentOS 7 (64-bit)')
+
+
+def _column_letter(number: int):
+    letters = ''
+    number += 1
+    while number:
+        number, remainder = divmod(number - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _cell(reference: str, value):
+    if isinstance(value, bool):
+        return '<c r="%s" t="b"><v>%d</v></c>' % (reference, value)
+    if isinstance(value, (int, float)):
+        return '<c r="%s"><v>%r</v></c>' % (reference, value)
+    return '<c r="%s" t="inlineStr"><is><t>%s</t></is></c>' % (
+        reference, escape(value))
+
+
+def _write_sheet(archive, path: str, columns: tuple, rows):
+    letters = [_column_letter(number) for number in range(len(columns))]
+    with archive.open(path, 'w') as sheet:
+        sheet.write(('<?xml version="1.0" encoding="UTF-8"?>'
+                     '<worksheet xmlns="%s"><sheetData>' % NS_MAIN).encode())
+        for number, row in enumerate(_with_header(columns, rows), 1):
+            cells = ''.join(_cell('%s%d' % (letter, number), value)
+                            for letter, value in zip(letters, row))
+            sheet.write(('<row r="%d">%s</row>' % (number, cells)).encode())
+        sheet.write(b'</sheetData></worksheet>')
+
+
+def _with_header(columns: tuple, rows):
+    yield columns
+    yield from rows
+
+
+class Generator(object):
+    """ Synthetic inventory, every row is generated on the fly """
+
+    def __init__(self, datacenters=2, clusters=4, hosts=8, vms=1000,
+                 disks=2, nics=1, partitions=2, datastores=20, seed=0,
+                 vcenter='vcenter.example.com'):
+        """
+        Constructor
+        :param datacenters: number of datacenters
+        :param clusters: number of clusters per datacenter
+        :param hosts: number of hosts per cluster
+        :param vms: number of VMs (spread over all the hosts)
+        :param disks: number of virtual disks per VM
+        :param nics: number of network adapters per VM
+        :param partitions: number of guest partitions per VM
+        :param datastores: number of datastores per cluster
+        :param seed: seed of the random values
+        :param vcenter: name of the vCenter ('VI SDK Server')
+        """
+        self.datacenters = datacenters
+        self.clusters = clusters
+        self.hosts = hosts
+        self.vms = vms
+        self.disks = disks
+        self.nics = nics
+        self.partitions = partitions
+        self.datastores = datastores
+        self.seed = seed
+        self.vcenter = vcenter
+
+    def _hosts(self):
+        """ Generator - (datacenter, cluster, host) of every host """
+        for dc in range(self.datacenters):
+            for cluster in range(self.clusters):
+                for host in range(self.hosts):
+                    yield ('dc%02d' % dc, 'dc%02d-cl%02d' % (dc, cluster),
+                           'esx-%02d-%02d-%03d.example.com' % (dc, cluster,
+                                                               host))
+
+    def _clusters(self):
+        """ Generator - (datacenter, cluster) of every cluster """
+        for dc in range(self.datacenters):
+            for cluster in range(self.clusters):
+                yield 'dc%02d' % dc, 'dc%02d-cl%02d' % (dc, cluster)
+
+    def _datastore(self, cluster: str, number: int):
+        return '%s-ds%03d' % (cluster, number % self.datastores)
+
+    def _vms(self):
+        """ Generator - (number, name, datacenter, cluster, host) """
+        hosts = list(self._hosts())
+        for number in range(self.vms):
+            dc, cluster, host = hosts[number % len(hosts)]
+            yield number, 'vm-%07d' % number, dc, cluster, host
+
+    def tab_vinfo(self):
+        rng = random.Random(self.seed)
+        start = datetime(2020, 1, 1)
+        for number, vm, dc, cluster, host in self._vms():
+            powered = rng.random() < 0.8
+            provisioned = rng.randint(20, 2000) * 1024
+            power_on = start + timedelta(seconds=rng.randint(0, 10 ** 8))
+            yield (vm, 'poweredOn' if powered else 'poweredOff',
+                   rng.choice((1, 2, 4, 8, 16)),
+                   rng.choice((1, 2, 4, 8, 16, 32, 64)) * 1024,
+                   provisioned, provisioned // rng.randint(1, 4),
+                   provisioned // 4,
+                   power_on.strftime(DATE_FORMAT) if powered else '',
+                   '[%s] %s/%s.vmx' % (self._datastore(cluster, number),
+                                       vm, vm),
+                   rng.choice(OPERATING_SYSTEMS), host, cluster, dc,
+                   self.vcenter)
+
+    def tab_vhost(self):
+        rng = random.Random(self.seed + 1)
+        vms_per_host = self.vms // max(
+            self.datacenters * self.clusters * self.hosts, 1)
+        for dc, cluster, host in self._hosts():
+            boot = datetime(2021, 1, 1) + timedelta(
+                seconds=rng.randint(0, 10 ** 7))
+            yield (host, dc, cluster, boot.strftime(DATE_FORMAT),
+                   rng.randint(5, 95), 'VMware ESXi 7.0.3 build-20328353',
+                   rng.choice((256, 512, 768)) * 1024, rng.randint(20, 90),
+                   'PowerEdge R740', rng.choice((32, 48, 64)), 2,
+                   vms_per_host * 4, vms_per_host, self.vcenter)
+
+    def tab_vhba(self):
+        for _, _, host in self._hosts():
+            yield (host, 'vmhba0', 'Block SCSI', 'Unknown', 'lsi_mr3',
+                   'PERC H730P', '')
+            for port in (1, 2):
+                yield (host, 'vmhba%d' % (port + 1), 'Fibre Channel',
+                       'Online', 'lpfc', 'LPe32002-M2',
+                       '20:00:00:10:9b:00:00:%02x 10:00:00:10:9b:00:00:%02x'
+                       % (port, port))
+
+    def tab_vdisk(self):
+        rng = random.Random(self.seed + 2)
+        for number, vm, _, cluster, _ in self._vms():
+            for disk in range(self.disks):
+                datastore = self._datastore(cluster, number + disk)
+                thin = rng.random() < 0.6
+                yield (vm, 'Hard disk %d' % (disk + 1),
+                       rng.randint(20, 1000) * 1024, thin,
+                       not thin and rng.random() < 0.2,
+                       '[%s] %s/%s_%d.vmdk' % (datastore, vm, vm, disk))
+
+    def tab_vnetwork(self):
+        for number, vm, _, cluster, _ in self._vms():
+            for nic in range(self.nics):
+                address = 167772160 + number * self.nics + nic
+                ip = '.'.join(str(address >> shift & 255)
+                              for shift in (24, 16, 8, 0))
+                yield (vm, 'poweredOn', 'VMXNET3',
+                       '%s-vlan%d' % (cluster, 100 + nic), 'dvSwitch0', True,
+                       '00:50:56:%02x:%02x:%02x' % (number >> 16 & 255,
+                                                    number >> 8 & 255,
+                                                    (number + nic) & 255),
+                       ip)
+
+    def tab_vpartition(self):
+        rng = random.Random(self.seed + 3)
+        for _, vm, _, _, _ in self._vms():
+            for partition in range(self.partitions):
+                capacity = rng.randint(10, 500) * 1024
+                free = rng.randint(0, capacity)
+                yield (vm, '/data%d' % partition if partition else '/',
+                       capacity, free, free * 100 // capacity)
+
+    def tab_vdatastore(self):
+        rng = random.Random(self.seed + 4)
+        for _, cluster in self._clusters():
+            hosts = ', '.join(host for _, host_cluster, host in self._hosts()
+                              if host_cluster == cluster)
+            for number in range(self.datastores):
+                capacity = rng.randint(4, 64) * 1024 * 1024
+                free = rng.randint(0, capacity)
+                yield ('%s-ds%03d' % (cluster, number),
+                       'naa.600%029x' % rng.getrandbits(116), 'VMFS',
+                       self.vms // max(self.datastores * self.clusters *
+                                       self.datacenters, 1),
+                       capacity, capacity + rng.randint(0, capacity),
+                       capacity - free, free, free * 100 // capacity, True,
+                       self.hosts, hosts, 6)
+
+    def write(self, filename: str):
+        """
+        Write the workbook
+        :param filename: path of the .xlsx file
+        """
+        tabs = {
+            'tabvInfo': self.tab_vinfo,
+            'tabvHost': self.tab_vhost,
+            'tabvHBA': self.tab_vhba,
+            'tabvDisk': self.tab_vdisk,
+            'tabvNetwork': self.tab_vnetwork,
+            'tabvPartition': self.tab_vpartition,
+            'tabvDatastore': self.tab_vdatastore,
+        }
+        names = list(tabs)
+        with zipfile.ZipFile(filename, 'w', zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr('[Content_Types].xml', (
+                '<?xml version="1.0" encoding="UTF-8"?>'
+                '<Types xmlns="http://schemas.openxmlformats.org/package/'
+                '2006/content-types">'
+                '<Default Extension="rels" ContentType="application/'
+                'vnd.openxmlformats-package.relationships+xml"/>'
+                '<Default Extension="xml" ContentType="application/xml"/>'
+                '<Override PartName="/xl/workbook.xml" ContentType="%s"/>'
+                '%s</Types>' % (WORKBOOK_TYPE, ''.join(
+                    '<Override PartName="/xl/worksheets/sheet%d.xml" '
+                    'ContentType="%s"/>' % (number, SHEET_TYPE)
+                    for number in range(1, len(names) + 1)))))
+            archive.writestr('_rels/.rels', (
+                '<?xml version="1.0" encoding="UTF-8"?>'
+                '<Relationships xmlns="%s"><Relationship Id="rId1" '
+                'Type="%s/officeDocument" Target="xl/workbook.xml"/>'
+                '</Relationships>' % (NS_PKG_REL, NS_REL)))
+            archive.writestr('xl/workbook.xml', (
+                '<?xml version="1.0" encoding="UTF-8"?>'
+                '<workbook xmlns="%s" xmlns:r="%s"><sheets>%s</sheets>'
+                '</workbook>' % (NS_MAIN, NS_REL, ''.join(
+                    '<sheet name="%s" sheetId="%d" r:id="rId%d"/>'
+                    % (name, number, number)
+                    for number, name in enumerate(names, 1)))))
+            archive.writestr('xl/_rels/workbook.xml.rels', (
+                '<?xml version="1.0" encoding="UTF-8"?>'
+                '<Relationships xmlns="%s">%s</Relationships>'
+                % (NS_PKG_REL, ''.join(
+                    '<Relationship Id="rId%d" Type="%s/worksheet" '
+                    'Target="worksheets/sheet%d.xml"/>'
+                    % (number, NS_REL, number)
+                    for number in range(1, len(names) + 1)))))
+            for number, name in enumerate(names, 1):
+                _write_sheet(archive, 'xl/worksheets/sheet%d.xml' % number,
+                             SHEETS[name], tabs[name]())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('output', help='path of the .xlsx file')
+    parser.add_argument('--datacenters', type=int, default=2)
+    parser.add_argument('--clusters', type=int, default=4,
+                        help='clusters per datacenter')
+    parser.add_argument('--hosts', type=int, default=8,
+                        help='hosts per cluster')
+    parser.add_argument('--vms', type=int, default=1000)
+    parser.add_argument('--disks', type=int, default=2, help='per VM')
+    parser.add_argument('--nics', type=int, default=1, help='per VM')
+    parser.add_argument('--partitions', type=int, default=2, help='per VM')
+    parser.add_argument('--datastores', type=int, default=20,
+                        help='per cluster')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    Generator(datacenters=args.datacenters, clusters=args.clusters,
+              hosts=args.hosts, vms=args.vms, disks=args.disks,
+              nics=args.nics, partitions=args.partitions,
+              datastores=args.datastores, seed=args.seed).write(args.output)
+
+
+if __name__ == '__main__':
+    main()
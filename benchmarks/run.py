@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# coding : utf-8
+
+"""
+Time the main operations of pyrvtools on synthetic workbooks of growing
+size and print the results as JSON
+
+usage: python -m benchmarks.run --vms 1000 10000 100000 --output out.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import tempfile
+import time
+import pyrvtools
+from benchmarks.generate import Generator
+from pyrvtools import PyRvtools
+
+LOOKUPS = 1000
+
+
+class Timer(object):
+    """ Context manager measuring the wall clock time of a block """
+
+    def __enter__(self):
+        self.seconds = None
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *_):
+        self.seconds = time.perf_counter() - self._start
+
+
+def bench_open(filename: str):
+    """ Open the file and parse every known sheet """
+    rvtools = PyRvtools(filename)
+    rvtools.inventory.sheets()
+    return len(rvtools.inventory.sheet('tabvInfo').column('VM'))
+
+
+def bench_iterate(rvtools: PyRvtools):
+    """ Create every VirtualMachine and Host object """
+    return len(list(rvtools.get_vm())) + len(list(rvtools.get_hosts()))
+
+
+def bench_properties(rvtools: PyRvtools):
+    """ Read the scalar properties of every VM """
+    count = 0
+    for vm in rvtools.get_vm():
+        (vm.cpu, vm.memory, vm.power_state, vm.provisioned_mb, vm.inuse_mb,
+         vm.os, vm.host, vm.cluster, vm.datacenter, vm.power_on)
+        count += 10
+    return count
+
+
+def bench_lookup(rvtools: PyRvtools, names: list):
+    """ Search VMs one by one by name """
+    for name in names:
+        rvtools.get_vm_by_name(name)
+    return len(names)
+
+
+def bench_traversal(rvtools: PyRvtools):
+    """ Walk datacenter > cluster > host > VM > disk > datastore """
+    count = 0
+    for datacenter in rvtools.get_datacenters():
+        for cluster in datacenter.clusters:
+            for host in cluster.hosts:
+                for vm in host.vm:
+                    for disk in vm.vmdk:
+                        disk.datastore
+                        count += 1
+    for datastore in rvtools.get_datastores():
+        count += len(datastore.vms)
+    return count
+
+
+def run(filename: str, vms: int, seed=0):
+    """
+    Run every benchmark on one workbook
+    :param filename: path of the RVTools file
+    :param vms: number of VMs of that file
+    :param seed: seed of the VM names picked for the lookups
+    :return list: one dictionary per benchmark
+    """
+    results = []
+
+    def record(name: str, timer: Timer, operations: int):
+        results.append({
+            'vms': vms,
+            'benchmark': name,
+            'seconds': round(timer.seconds, 6),
+            'operations': operations,
+            'per_second': round(operations / timer.seconds, 1)
+            if timer.seconds else None,
+        })
+
+    with Timer() as timer:
+        operations = bench_open(filename)
+    record('open', timer, operations)
+
+    rvtools = PyRvtools(filename)
+    rvtools.inventory.sheets()
+    names = random.Random(seed).sample(
+        list(rvtools.inventory.sheet('tabvInfo').column('VM')),
+        min(LOOKUPS, vms))
+
+    for name, bench, args in (('iterate', bench_iterate, ()),
+                              ('properties', bench_properties, ()),
+                              ('lookup', bench_lookup, (names,)),
+                              ('traversal', bench_traversal, ())):
+        with Timer() as timer:
+            operations = bench(rvtools, *args)
+        record(name, timer, operations)
+    return results
+
+
+def workbook(directory: str, generator: Generator):
+    """
+    Return the path of a synthetic workbook, generated once per size
+    :param directory: directory of the generated files
+    :param generator: the Generator of that workbook
+    """
+    filename = os.path.join(directory, 'rvtools-%d-%d-%d-%d.xlsx' % (
+        generator.vms, generator.disks, generator.nics, generator.partitions))
+    if not os.path.isfile(filename):
+        generator.write(filename)
+    return filename
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--vms', type=int, nargs='+',
+                        default=[1000, 10000, 100000],
+                        help='sizes of the generated workbooks')
+    parser.add_argument('--disks', type=int, default=2, help='per VM')
+    parser.add_argument('--nics', type=int, default=1, help='per VM')
+    parser.add_argument('--partitions', type=int, default=2, help='per VM')
+    parser.add_argument('--workdir', default=tempfile.gettempdir(),
+                        help='directory of the generated workbooks')
+    parser.add_argument('--output', help='JSON file (default: stdout)')
+    args = parser.parse_args()
+
+    results = []
+    for vms in args.vms:
+        # Keep about 30 VMs per host whatever the size
+        hosts = max(vms // (30 * 2 * 4), 1)
+        generator = Generator(vms=vms, hosts=hosts, disks=args.disks,
+                              nics=args.nics, partitions=args.partitions)
+        results.extend(run(workbook(args.workdir, generator), vms))
+
+    report = {
+        'pyrvtools': pyrvtools.__version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as fh:
+            json.dump(report, fh, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
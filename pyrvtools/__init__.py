@@ -1,4 +1,6 @@
 from pyrvtools.pyrvtools import PyRvtools
+from pyrvtools.diff import diff
+from pyrvtools.aio import AsyncPyRvtools
 
 __version__ = '1.0.1'
 __author__ = 'Julien B.'
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# coding : utf-8
+
+from collections import namedtuple
+from pyrvtools.errors import PyRvtoolsError
+from pyrvtools.inventory import Inventory
+from pyrvtools.schema import datastore_name, decode, number, ratio
+
+# Column of tabvInfo and tabvHost giving the group of a row
+GROUPS = {
+    'datacenter': 'Datacenter',
+    'cluster': 'Cluster',
+    'host': 'Host',
+    'datastore': None,
+}
+
+FIELDS = ('vms', 'vcpu', 'vmemory_mb', 'provisioned_mb', 'inuse_mb',
+          'hosts', 'cores', 'memory_mb', 'capacity_mb', 'free_mb')
+POSITIONS = {field: position for position, field in enumerate(FIELDS)}
+
+
+class Capacity(namedtuple('Capacity', FIELDS)):
+    """ Capacity figures of a group of VMs, hosts and datastores """
+
+    __slots__ = ()
+
+    @property
+    def memory_overcommit(self):
+        """ Memory of the VMs / physical memory of the hosts """
+        return ratio(self.vmemory_mb, self.memory_mb)
+
+    @property
+    def storage_inuse_ratio(self):
+        """ Storage used by the VMs / storage provisioned to the VMs """
+        return ratio(self.inuse_mb, self.provisioned_mb)
+
+    @property
+    def storage_provisioned_ratio(self):
+        """ Storage provisioned to the VMs / capacity of the datastores """
+        return ratio(self.provisioned_mb, self.capacity_mb)
+
+    @property
+    def vcpu_per_core(self):
+        """ vCPUs of the VMs / physical cores of the hosts """
+        return ratio(self.vcpu, self.cores)
+
+
+def _host_groups(inventory: Inventory, by: str):
+    """
+    Return a dictionary with HOST_NAME:[GROUPS] (a host can be linked to
+    several datastores)
+    """
+    groups = {}
+    if by == 'datastore':
+        datastores = inventory.sheet('tabvDatastore')
+        for name, hosts in zip(datastores.column('Name'),
+                               datastores.column('Hosts')):
+            for host in decode('Hosts', hosts):
+                groups.setdefault(host, []).append(name)
+    else:
+        hosts = inventory.sheet('tabvHost')
+        for host, group in zip(hosts.column('Host'),
+                               hosts.column(GROUPS[by])):
+            groups.setdefault(host, []).append(group)
+    return groups
+
+
+def aggregate(inventory: Inventory, by='cluster'):
+    """
+    Compute the capacity figures of an inventory, grouped by datacenter,
+    cluster, host or datastore (VMs are linked to their home datastore)
+    :param inventory: the Inventory of the RVTools file
+    :param by: 'datacenter', 'cluster', 'host' or 'datastore'
+    :return dict: a dictionary with GROUP_NAME:Capacity
+    """
+    if by not in GROUPS:
+        raise PyRvtoolsError('Unknown grouping: %s' % by)
+
+    totals = {}
+
+    def add(group, field, value):
+        if group not in totals:
+            totals[group] = [0] * len(FIELDS)
+        totals[group][POSITIONS[field]] += value
+
+    vms = inventory.sheet('tabvInfo')
+    if by == 'datastore':
+        vm_groups = [datastore_name(path) for path in vms.column('Path')]
+    else:
+        vm_groups = vms.column(GROUPS[by])
+    for group, cpu, memory, provisioned, inuse in zip(
+            vm_groups, vms.column('CPUs'), vms.column('Memory'),
+            vms.column('Provisioned MB'), vms.column('In Use MB')):
+        add(group, 'vms', 1)
+        add(group, 'vcpu', number(cpu))
+        add(group, 'vmemory_mb', number(memory))
+        add(group, 'provisioned_mb', number(provisioned))
+        add(group, 'inuse_mb', number(inuse))
+
+    host_groups = _host_groups(inventory, by)
+    hosts = inventory.sheet('tabvHost')
+    for host, cores, memory in zip(hosts.column('Host'),
+                                   hosts.column('# Cores'),
+                                   hosts.column('# Memory')):
+        for group in host_groups.get(host, []):
+            add(group, 'hosts', 1)
+            add(group, 'cores', number(cores))
+            add(group, 'memory_mb', number(memory))
+
+    datastores = inventory.sheet('tabvDatastore')
+    for name, hosts, capacity, free in zip(datastores.column('Name'),
+                                           datastores.column('Hosts'),
+                                           datastores.column('Capacity MB'),
+                                           datastores.column('Free MB')):
+        if by == 'datastore':
+            groups = {name}
+        else:
+            groups = set()
+            for host in decode('Hosts', hosts):
+                groups.update(host_groups.get(host, []))
+        for group in groups:
+            add(group, 'capacity_mb', number(capacity))
+            add(group, 'free_mb', number(free))
+
+    return {group: Capacity(*values) for group, values in totals.items()}
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# coding : utf-8
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from pyrvtools.esx_types import (Cluster, DataCenter, DataStore, Host,
+                                 VirtualMachine)
+from pyrvtools.pyrvtools import PyRvtools
+
+
+class AsyncPyRvtools(object):
+    """
+    Asyncio facade of PyRvtools: the parsing of the sheets runs in a
+    bounded pool of threads, so the event loop is never blocked, and the
+    concurrent loads of the same sheet share one parsing
+    """
+
+    def __init__(self, rvtools: PyRvtools, max_workers=2, executor=None):
+        """
+        Constructor
+        :param rvtools: the PyRvtools of the RVTools file
+        :param max_workers: maximum number of threads
+        :param executor: pool of threads to use instead of a new one
+        """
+        self._rvtools = rvtools
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=max_workers)
+        self._loads = {}
+        # Jobs submitted to the pool and not finished yet
+        self._pending = set()
+
+    @classmethod
+    async def open(cls, filename: str, max_workers=2, **kwargs):
+        """
+        Open an RVTools file without blocking the event loop
+        :param filename: RVTools inventory file
+        :param max_workers: maximum number of threads
+        :param kwargs: other arguments of PyRvtools
+        :return AsyncPyRvtools
+        """
+        loop = asyncio.get_event_loop()
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            rvtools = await loop.run_in_executor(
+                executor, functools.partial(PyRvtools, filename, **kwargs))
+        except BaseException:
+            executor.shutdown(wait=False)
+            raise
+        return cls(rvtools, executor=executor)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        await self.close()
+
+    @property
+    def rvtools(self):
+        """ The synchronous PyRvtools behind that facade """
+        return self._rvtools
+
+    async def close(self):
+        """ Wait for the running jobs and stop the threads """
+        self._executor.shutdown(wait=False)
+        if self._pending:
+            await asyncio.wait(list(self._pending))
+
+    async def _run(self, func, *args, **kwargs):
+        """ Run a blocking function in the pool of threads """
+        loop = asyncio.get_event_loop()
+        future = loop.run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs))
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+        return await future
+
+    async def load_sheet(self, name: str):
+        """
+        Parse a sheet (once), the concurrent calls wait for the same job
+        :param name: Name of the sheet
+        :return SheetIndex
+        """
+        inventory = self._rvtools.inventory
+        if name in inventory.loaded():
+            return inventory.sheet(name)
+
+        future = self._loads.get(name)
+        if future is None:
+            future = asyncio.ensure_future(self._run(inventory.sheet, name))
+            self._loads[name] = future
+            future.add_done_callback(lambda _: self._loads.pop(name, None))
+        return await asyncio.shield(future)
+
+    async def _objects(self, cls, method: str):
+        """
+        Async generator - Return the objects of a generator of PyRvtools
+        (the names are collected and the objects created in the pool of
+        threads)
+        :param cls: class of the ESX objects
+        :param method: Name of the generator (ex: 'get_vm')
+        """
+        await self.load_sheet(cls.SHEET)
+        objects = await self._run(list, getattr(self._rvtools, method)())
+        for one in objects:
+            yield one
+
+    async def _lookup(self, cls, method: str, *args, **kwargs):
+        """
+        Call a lookup method of PyRvtools in the pool of threads once its
+        sheet is loaded (the first search builds the hash index of the key
+        column)
+        :param cls: class of the ESX objects
+        :param method: Name of the method (ex: 'get_vm_by_name')
+        """
+        await self.load_sheet(cls.SHEET)
+        return await self._run(getattr(self._rvtools, method),
+                               *args, **kwargs)
+
+    async def fetch(self, obj, *properties):
+        """
+        Read some properties of an object without blocking the event loop
+        (ex: await rvtools.fetch(vm, 'vmdk', 'host'))
+        :param obj: an ESX object
+        :param properties: names of the properties
+        :return: the value of the property, or a tuple of values
+        """
+        await self.load_sheet(obj.SHEET)
+
+        def read():
+            return tuple(getattr(obj, name) for name in properties)
+
+        values = await self._run(read)
+        return values[0] if len(values) == 1 else values
+
+    async def run(self, method: str, *args, **kwargs):
+        """
+        Call any other method of PyRvtools in the pool of threads
+        (ex: await rvtools.run('aggregate', by='host'))
+        :param method: Name of the method
+        """
+        return await self._run(getattr(self._rvtools, method),
+                               *args, **kwargs)
+
+    def get_clusters(self):
+        """ Async generator - return the Cluster objects """
+        return self._objects(Cluster, 'get_clusters')
+
+    def get_datacenters(self):
+        """ Async generator - return the DataCenter objects """
+        return self._objects(DataCenter, 'get_datacenters')
+
+    def get_datastores(self):
+        """ Async generator - return the DataStore objects """
+        return self._objects(DataStore, 'get_datastores')
+
+    def get_hosts(self):
+        """ Async generator - return the Host objects """
+        return self._objects(Host, 'get_hosts')
+
+    def get_vm(self):
+        """ Async generator - return the VirtualMachine objects """
+        return self._objects(VirtualMachine, 'get_vm')
+
+    async def get_clusters_by_name(self, name):
+        """ Search a Cluster object and return it """
+        return await self._lookup(Cluster, 'get_clusters_by_name', name)
+
+    async def get_clusters_by_names(self, names, strict=False):
+        """ Search several Cluster objects in one pass """
+        return await self._lookup(Cluster, 'get_clusters_by_names', names,
+                                  strict=strict)
+
+    async def get_datacenter_by_name(self, name):
+        """ Search a DataCenter object and return it """
+        return await self._lookup(DataCenter, 'get_datacenter_by_name', name)
+
+    async def get_datacenters_by_names(self, names, strict=False):
+        """ Search several DataCenter objects in one pass """
+        return await self._lookup(DataCenter, 'get_datacenters_by_names',
+                                  names, strict=strict)
+
+    async def get_datastore_by_name(self, name):
+        """ Search a DataStore object and return it """
+        return await self._lookup(DataStore, 'get_datastore_by_name', name)
+
+    async def get_datastores_by_names(self, names, strict=False):
+        """ Search several DataStore objects in one pass """
+        return await self._lookup(DataStore, 'get_datastores_by_names',
+                                  names, strict=strict)
+
+    async def get_host_by_name(self, name):
+        """ Search a Host object and return it """
+        return await self._lookup(Host, 'get_host_by_name', name)
+
+    async def get_hosts_by_names(self, names, strict=False):
+        """ Search several Host objects in one pass """
+        return await self._lookup(Host, 'get_hosts_by_names', names,
+                                  strict=strict)
+
+    async def get_vm_by_name(self, name):
+        """ Search a VirtualMachine object and return it """
+        return await self._lookup(VirtualMachine, 'get_vm_by_name', name)
+
+    async def get_vms_by_names(self, names, strict=False):
+        """ Search several VirtualMachine objects in one pass """
+        return await self._lookup(VirtualMachine, 'get_vms_by_names', names,
+                                  strict=strict)
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# coding : utf-8
+
+import hashlib
+import json
+import marshal
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pyrvtools.index import make_column
+from pyrvtools.inventory import Inventory
+from pyrvtools.readers import Reader
+from pyrvtools.schema import KEYS, SHEETS
+
+MAGIC = b'PYRVC01' + (b'L' if sys.byteorder == 'little' else b'B')
+HEADER = struct.Struct('<I')
+
+
+class CacheReader(Reader):
+    """ Reader of a cache file (mmap), sheets are decoded on demand """
+
+    def __init__(self, filename: str, cache_file: str):
+        """
+        Constructor
+        :param filename: RVTools inventory file
+        :param cache_file: cache file matching that RVTools file
+        """
+        super().__init__(filename)
+        with open(cache_file, 'rb') as fh:
+            self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._map[:len(MAGIC)] != MAGIC:
+            raise ValueError('Not a cache file: %s' % cache_file)
+        start = len(MAGIC) + HEADER.size
+        length, = HEADER.unpack_from(self._map, len(MAGIC))
+        self._header = json.loads(self._map[start:start + length].decode())
+        self._offset = start + length
+
+        if not isinstance(self._header, dict) or any(
+                key not in self._header
+                for key in ('sheet_names', 'schema', 'sheets')):
+            raise ValueError('Malformed cache file: %s' % cache_file)
+        if self._header['schema'] != json.loads(json.dumps(SHEETS)):
+            raise ValueError('Outdated cache file: %s' % cache_file)
+
+    def _blob(self, position: list):
+        """
+        Return the raw bytes of a blob
+        :param position: (offset, length) of the blob
+        """
+        offset, length = position
+        offset += self._offset
+        return self._map[offset:offset + length]
+
+    def read_sheet(self, name: str, columns=None):
+        data = {}
+        sheet = self._header['sheets'][name]
+        for col_name, kind, position in sheet['columns']:
+            if columns is not None and col_name not in columns:
+                continue
+            if kind == 'd':
+                values = array('d')
+                values.frombytes(self._blob(position))
+                data[col_name] = values
+            else:
+                data[col_name] = make_column(
+                    marshal.loads(self._blob(position)), numeric=False)
+        return data
+
+    def read_header(self, name: str):
+        columns = self._header['sheets'][name]['columns']
+        return [col_name for col_name, _, _ in columns]
+
+    def read_indexes(self, name: str):
+        indexes = {}
+        for col_name, position in self._header['sheets'][name]['indexes']:
+            indexes[col_name] = marshal.loads(self._blob(position))
+        return indexes
+
+    def sheet_names(self):
+        return self._header['sheet_names']
+
+
+class InventoryCache(object):
+    """ On-disk cache of the parsed sheets of an RVTools file """
+
+    def __init__(self, cache_dir: str, filename: str):
+        """
+        Constructor
+        :param cache_dir: directory where the cache files are stored
+        :param filename: RVTools inventory file
+        """
+        self._cache_dir = cache_dir
+        self._filename = filename
+        self._digest = None
+        # digest of the previous version of the file, its cache file is
+        # removed when the new version is stored
+        self._previous_digest = None
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, name: str):
+        return os.path.join(self._cache_dir, name)
+
+    @property
+    def digest(self):
+        """
+        Content hash of the RVTools file, only computed again when the
+        size or the modification time of the file has changed
+        """
+        if self._digest is None:
+            stat = os.stat(self._filename)
+            signature = '%d %d' % (stat.st_size, stat.st_mtime_ns)
+            path = os.path.abspath(self._filename).encode()
+            key_file = self._path(hashlib.sha1(path).hexdigest() + '.key')
+
+            try:
+                with open(key_file) as fh:
+                    known_signature, digest = fh.read().rsplit(' ', 1)
+                if known_signature == signature:
+                    self._digest = digest
+                else:
+                    self._previous_digest = digest
+            except (OSError, ValueError):
+                pass
+
+            if self._digest is None:
+                content = hashlib.sha1()
+                with open(self._filename, 'rb') as fh:
+                    for chunk in iter(lambda: fh.read(1 << 20), b''):
+                        content.update(chunk)
+                self._digest = content.hexdigest()
+                self._write(key_file, ('%s %s' % (signature, self._digest))
+                            .encode())
+        return self._digest
+
+    @property
+    def cache_file(self):
+        return self._path(self.digest + '.pyrvc')
+
+    def _write(self, path: str, content: bytes):
+        """ Atomic write of a file """
+        tmp_path = '%s.%d.tmp' % (path, os.getpid())
+        with open(tmp_path, 'wb') as fh:
+            fh.write(content)
+        os.replace(tmp_path, path)
+
+    def load(self):
+        """
+        Return a CacheReader on the cached file, None if it's not cached
+        """
+        try:
+            return CacheReader(self._filename, self.cache_file)
+        except (OSError, ValueError, KeyError, struct.error):
+            # missing, outdated or damaged cache file
+            return None
+
+    def store(self, inventory: Inventory):
+        """
+        Parse and index every known sheet of an inventory, then write them
+        in the cache
+        :param inventory: the Inventory of the RVTools file
+        """
+        header = {'sheet_names': list(inventory.sheet_names()),
+                  'schema': SHEETS,
+                  'sheets': {}}
+        blobs = []
+        size = 0
+
+        def add_blob(blob: bytes):
+            nonlocal size
+            blobs.append(blob)
+            size += len(blob)
+            return size - len(blob), len(blob)
+
+        for name, sheet in inventory.sheets().items():
+            columns, indexes = [], []
+            for col_name, values in sheet.columns.items():
+                if isinstance(values, array):
+                    columns.append((col_name, 'd',
+                                    add_blob(values.tobytes())))
+                else:
+                    columns.append((col_name, 'm',
+                                    add_blob(marshal.dumps(values))))
+            for col_name in KEYS.get(name, ()):
+                if col_name in sheet.columns:
+                    indexes.append((col_name, add_blob(
+                        marshal.dumps(sheet.index(col_name)))))
+            header['sheets'][name] = {'columns': columns, 'indexes': indexes}
+
+        header = json.dumps(header).encode()
+        content = [MAGIC, HEADER.pack(len(header)), header] + blobs
+        self._write(self.cache_file, b''.join(content))
+
+        # a copy of the previous file (same content) may still use it
+        previous = self._previous_digest
+        if previous not in (None, self.digest) and \
+                not self._referenced(previous):
+            try:
+                os.remove(self._path(previous + '.pyrvc'))
+            except OSError:
+                pass
+        self._previous_digest = None
+
+    def _referenced(self, digest: str):
+        """
+        Tell if the key file of a path points at a content digest
+        :param digest: content hash of an RVTools file
+        """
+        for name in os.listdir(self._cache_dir):
+            if not name.endswith('.key'):
+                continue
+            try:
+                with open(self._path(name)) as fh:
+                    if fh.read().rsplit(' ', 1)[-1] == digest:
+                        return True
+            except OSError:
+                continue
+        return False
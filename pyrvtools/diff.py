@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# coding : utf-8
+
+from collections import namedtuple
+from pyrvtools.esx_types import (Cluster, DataCenter, DataStore, Host,
+                                 VirtualMachine)
+from pyrvtools.schema import datastore_name
+
+Change = namedtuple('Change', ('kind', 'type', 'key', 'field', 'old', 'new'))
+Change.__doc__ = """ One difference between two RVTools files
+kind: 'added', 'removed' or 'changed'
+type: name of the ESX class (VirtualMachine, VDisk...)
+key: name (or tuple of names) identifying the object
+field: name of the changed property (None when added/removed)
+"""
+
+# (type, sheet, key columns, {property: column}), the objects of the tiny
+# classes (VDisk, VNetwork...) are identified by their parent and a name
+SPECS = (
+    ('DataCenter', DataCenter.SHEET, (DataCenter.KEY,), {}),
+    ('Cluster', Cluster.SHEET, (Cluster.KEY,),
+     {'datacenter': 'Datacenter'}),
+    ('Host', Host.SHEET, (Host.KEY,), Host.FIELDS),
+    ('HBA', 'tabvHBA', ('Host', 'Device'),
+     {'status': 'Status', 'type': 'Type', 'driver': 'Driver',
+      'model': 'Model', 'wwn': 'WWN'}),
+    ('DataStore', DataStore.SHEET, (DataStore.KEY,), DataStore.FIELDS),
+    ('VirtualMachine', VirtualMachine.SHEET, (VirtualMachine.KEY,),
+     dict(VirtualMachine.FIELDS, datastore='Path')),
+    ('VDisk', 'tabvDisk', ('VM', 'Disk'),
+     {'capacity_mb': 'Capacity MB', 'thin': 'Thin',
+      'eagerly_scrub': 'Eagerly Scrub', 'datastore': 'Path'}),
+    ('VNetwork', 'tabvNetwork', ('VM', 'Mac Address'),
+     {'adapter': 'Adapter', 'connected': 'Connected',
+      'ip_address': 'IP Address', 'network': 'Network',
+      'switch': 'Switch'}),
+    ('VPartition', 'tabvPartition', ('VM', 'Disk'),
+     {'capacity_mb': 'Capacity MB', 'free_mb': 'Free MB'}),
+)
+
+
+def _typed(column: str, value):
+    """ Comparable value of a cell (datastore of a path, int numbers) """
+    if column == 'Path':
+        return datastore_name(value)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _rows(inventory, sheet_name: str, keys: tuple):
+    """
+    Hash table of the rows of a sheet (the first row wins for duplicates)
+    :return dict: a dictionary with KEY:ROW_OFFSET
+    """
+    if sheet_name not in inventory.sheet_names():
+        return {}
+    sheet = inventory.sheet(sheet_name)
+    if len(keys) == 1:
+        key_values = sheet.column(keys[0])
+    else:
+        key_values = zip(*(sheet.column(key) for key in keys))
+
+    rows = {}
+    for offset, key in enumerate(key_values):
+        if key and key not in rows:
+            rows[key] = offset
+    return rows
+
+
+def diff(old, new):
+    """
+    Generator - Return the differences between two RVTools files, the
+    rows of both files are joined through hash tables (linear time)
+    :param old: the PyRvtools object of the older file
+    :param new: the PyRvtools object of the newer file
+    :return Change
+    """
+    for type_name, sheet_name, keys, fields in SPECS:
+        old_rows = _rows(old.inventory, sheet_name, keys)
+        new_rows = _rows(new.inventory, sheet_name, keys)
+
+        for key in old_rows.keys() - new_rows.keys():
+            yield Change('removed', type_name, key, None, None, None)
+
+        for key in new_rows.keys() - old_rows.keys():
+            yield Change('added', type_name, key, None, None, None)
+
+        # a sheet missing from one file (ex: tabvNetwork of old exports)
+        # only has added or removed records
+        if not fields or sheet_name not in old.inventory.sheet_names() or \
+                sheet_name not in new.inventory.sheet_names():
+            continue
+
+        old_sheet = old.inventory.sheet(sheet_name)
+        new_sheet = new.inventory.sheet(sheet_name)
+        for field, column in sorted(fields.items()):
+            if field == 'name':
+                continue
+            if column not in old_sheet.columns:
+                continue
+            if column not in new_sheet.columns:
+                continue
+            old_values = old_sheet.column(column)
+            new_values = new_sheet.column(column)
+            for key, old_row in old_rows.items():
+                new_row = new_rows.get(key)
+                if new_row is None:
+                    continue
+                old_value = _typed(column, old_values[old_row])
+                new_value = _typed(column, new_values[new_row])
+                if old_value != new_value:
+                    yield Change('changed', type_name, key, field,
+                                 old_value, new_value)
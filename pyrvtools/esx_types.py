@@ -1,26 +1,38 @@
 #!/usr/bin/env python3
 # coding : utf-8
 
-import pyrvtools.pyrvtools
-from datetime import datetime
-from xlrd import book
-from xlrd.sheet import Sheet
+from pyrvtools.inventory import Inventory
+from pyrvtools.schema import datastore_name, percent
+
+
+def _naa(address):
+    """ NAA identifier of a datastore address (empty if not a LUN) """
+    if address and address.startswith('naa.'):
+        return address.split('.')[1]
+    return ''
 
 
 class ESXBase(object):
     """ Super class of every ESX object """
 
-    def __init__(self, workbook: book, name: str):
+    # Sheet and column where the object is searched by name, and the
+    # columns behind its properties (property:column)
+    SHEET = None
+    KEY = None
+    FIELDS = {}
+    # Properties that transform the typed value of their column
+    # (property:function)
+    CONVERSIONS = {}
+
+    def __init__(self, inventory: Inventory, name: str):
         """
         Constructor
-        :param workbook: a workbook XLRD
+        :param inventory: the shared Inventory of the RVTools file
         :param name: Name of that ESX object
         """
-        self._book = workbook
+        self._inventory = inventory
         self._name = name
-        self._data = None
-        self._sheet = None
-        self._column = None
+        self._row = None
 
     def __eq__(self, other):
         compare = False
@@ -30,67 +42,118 @@ class ESXBase(object):
             compare = self.name == other.name
         return compare
 
+    def __hash__(self):
+        return hash(self._name)
+
     def __repr__(self):
         return '%s(%s)' % (self.__class__.__name__, self._name)
 
     def __str__(self):
         return self._name
 
-    # only_one : just to speed up the search in case of unique value
-
-    def _search(self, sheet: Sheet, column: str, target: str, only_one=False):
+    def _search_rows(self, sheet: str, column: str, target: str):
         """
-        Generic search method
-        :param sheet: A Sheet XLRD Object where perform the search
+        Return the offsets of every row matching the target
+        :param sheet: Name of the sheet where perform the search
         :param column: Name of the column where perform the search
         :param target: Value to find
-        :param only_one: (boolean) search one (true) or multiple values (false)
-        :return dict: a dictionary with a complete row of data
+        :return list: a list of row offsets
+        """
+        return self._inventory.sheet(sheet).find(column, target)
+
+    def _related(self, relation: str, cls):
+        """
+        Return the objects linked to this one in the relationship graph
+        :param relation: Name of the relation (ex: 'cluster_hosts')
+        :param cls: class of the related objects
+        :return list: a list of ESX objects
         """
-        target_rows = []
-        column_names = pyrvtools.pyrvtools.PyRvtools.get_columns_names(sheet)
-        for row_number in range(sheet.nrows):
-            if sheet.cell_value(row_number, column_names[column]) == target:
-                target_rows.append(row_number)
-
-                if target_rows and only_one:
-                    break
-
-        all_answer = []
-        for target_row in target_rows:
-            one_answer = {}
-            for col_name, col_number in column_names.items():
-                one_answer[col_name] = sheet.cell_value(target_row, col_number)
-            all_answer.append(one_answer)
-        return all_answer
+        names = self._inventory.graph.related(relation, self._name)
+        return [self._inventory.get(cls, name) for name in names]
 
     def _search_one_value(self, item):
         """
-        Search only one occurrence of a value in the embedded sheet
+        Search only one occurrence of a value in the embedded sheet,
+        converted to the type of its column (see schema.TYPES)
         :param item: item to find
         """
-        if not self._data:
-            self._data = self._search(self._sheet, self._column,
-                                      self._name, only_one=True)
-        return self._data[0][item]
+        index = self._inventory.sheet(self.SHEET)
+        if self._row is None:
+            self._row = index.find(self.KEY, self._name)[0]
+        if index.stats is not None:
+            index.stats.count('properties', '%s.%s' % (
+                self.__class__.__name__, item))
+        return index.typed_value(self._row, item)
+
+    def refresh(self):
+        """ Forget the cached row and related objects (file reloaded) """
+        self.__init__(self._inventory, self._name)
 
     @property
     def name(self):
         return self._name
 
+    @property
+    def source(self):
+        return self._inventory.filename
+
+    @property
+    def vcenter(self):
+        return self._inventory.vcenter
+
+
+class RowBase(object):
+    """ Super class of the tiny objects, a reference to one row of a sheet """
+
+    __slots__ = ('_inventory', '_row')
+    SHEET = None
+
+    def __init__(self, inventory: Inventory, row: int):
+        """
+        Constructor
+        :param inventory: the shared Inventory of the RVTools file
+        :param row: offset of the row in the sheet
+        """
+        self._inventory = inventory
+        self._row = row
+        if inventory.stats is not None:
+            inventory.stats.count('objects_created', self.__class__.__name__)
+
+    def _value(self, column: str):
+        """
+        Return one value of the row, converted to the type of its column
+        :param column: Name of the column
+        """
+        index = self._inventory.sheet(self.SHEET)
+        if index.stats is not None:
+            index.stats.count('properties', '%s.%s' % (
+                self.__class__.__name__, column))
+        return index.typed_value(self._row, column)
+
+    def values(self):
+        """
+        Return every value of the row, converted to the type of its column
+        :return dict: a dictionary with COLUMN_NAME:VALUE
+        """
+        index = self._inventory.sheet(self.SHEET)
+        return {column: index.typed_value(self._row, column)
+                for column in index.columns}
+
 
 class Cluster(ESXBase):
     """ Object that's represent a vSphere Cluster """
 
-    def __init__(self, workbook: book, name: str):
+    SHEET = 'tabvHost'
+    KEY = 'Cluster'
+    FIELDS = {'name': 'Cluster', 'datacenter': 'Datacenter'}
+
+    def __init__(self, inventory: Inventory, name: str):
         """
         Contructor
-        :param workbook: a XLRD workbook
+        :param inventory: the shared Inventory of the RVTools file
         :param name: name of the Cluster
         """
-        super().__init__(workbook, name)
-        self._sheet = self._book.sheet_by_name('tabvHost')
-        self._column = 'Cluster'
+        super().__init__(inventory, name)
         self._hosts = []
 
     @property
@@ -100,10 +163,7 @@ class Cluster(ESXBase):
     @property
     def hosts(self):
         if not self._hosts:
-            data = self._search(sheet=self._sheet, column='Cluster',
-                                target=self._name)
-            for host in data:
-                self._hosts.append(Host(self._book, host['Host']))
+            self._hosts = self._related('cluster_hosts', Host)
 
         return self._hosts
 
@@ -111,41 +171,31 @@ class Cluster(ESXBase):
 class DataCenter(ESXBase):
     """ Object that's represent a vSphere DataCenter """
 
-    def __init__(self, workbook: book, name: str):
+    SHEET = 'tabvHost'
+    KEY = 'Datacenter'
+    FIELDS = {'name': 'Datacenter'}
+
+    def __init__(self, inventory: Inventory, name: str):
         """
         Contructor
-        :param workbook: a XLRD workbook
+        :param inventory: the shared Inventory of the RVTools file
         :param name: name of that DataCenter
         """
-        super().__init__(workbook, name)
-        self._sheet = self._book.sheet_by_name('tabvHost')
-        self._column = 'Datacenter'
+        super().__init__(inventory, name)
         self._clusters = []
         self._hosts = []
 
     @property
     def clusters(self):
         if not self._clusters:
-            data = self._search(sheet=self._sheet, column='Datacenter',
-                                target=self._name)
-            for cluster in data:
-                if any(i.name == cluster['Cluster'] for i in self._clusters):
-                    continue
-
-                if not cluster['Cluster']:
-                    continue
-
-                self._clusters.append(Cluster(self._book, cluster['Cluster']))
+            self._clusters = self._related('datacenter_clusters', Cluster)
 
         return self._clusters
 
     @property
     def hosts(self):
         if not self._hosts:
-            data = self._search(sheet=self._sheet, column='Datacenter',
-                                target=self._name)
-            for host in data:
-                self._hosts.append(Host(self._book, host['Host']))
+            self._hosts = self._related('datacenter_hosts', Host)
 
         return self._hosts
 
@@ -153,63 +203,69 @@ class DataCenter(ESXBase):
 class DataStore(ESXBase):
     """ Object that's represent a vSphere DataStore """
 
-    def __init__(self, workbook: book, name: str):
+    SHEET = 'tabvDatastore'
+    KEY = 'Name'
+    FIELDS = {'name': 'Name', 'capacity_mb': 'Capacity MB',
+              'free_mb': 'Free MB', 'free_percent': 'Free %',
+              'hosts': 'Hosts', 'inuse_mb': 'In Use MB', 'naa': 'Address',
+              'number_of_hosts': '# Hosts', 'number_of_vms': '# VMs',
+              'provisioned_mb': 'Provisioned MB',
+              'sioc_enable': 'SIOC enabled', 'type': 'Type',
+              'version': 'Major Version'}
+    CONVERSIONS = {'naa': _naa, 'version': str}
+
+    def __init__(self, inventory: Inventory, name: str):
         """
         Constructor
-        :param workbook: a XLRD workbook
+        :param inventory: the shared Inventory of the RVTools file
         :param name: name of that DataStore
         """
-        super().__init__(workbook, name)
-        self._sheet = self._book.sheet_by_name('tabvDatastore')
-        self._column = 'Name'
+        super().__init__(inventory, name)
         self._hosts = []
+        self._vms = []
 
     @property
     def capacity_mb(self):
-        return int(self._search_one_value('Capacity MB'))
+        return self._search_one_value('Capacity MB')
 
     @property
     def free_mb(self):
-        return int(self._search_one_value('Free MB'))
+        return self._search_one_value('Free MB')
 
     @property
     def free_percent(self):
-        return int(self._search_one_value('Free %'))
+        return self._search_one_value('Free %')
 
     @property
     def hosts(self):
         if not self._hosts:
-            hosts = self._search_one_value('Hosts')
-            for host in hosts.split(', '):
-                self._hosts.append(Host(self._book, host))
+            self._hosts = self._related('datastore_hosts', Host)
 
         return self._hosts
 
     @property
     def inuse_mb(self):
-        return int(self._search_one_value('In Use MB'))
+        return self._search_one_value('In Use MB')
 
     @property
     def naa(self):
-        naa = self._search_one_value('Address')
-        naa = naa.split('.')[1] if naa and naa.startswith('naa.') else ''
-        return naa
+        return _naa(self._search_one_value('Address'))
 
     @property
     def number_of_hosts(self):
-        return int(self._search_one_value('# Hosts'))
+        return self._search_one_value('# Hosts')
 
     @property
     def number_of_vms(self):
-        return int(self._search_one_value('# VMs'))
+        return self._search_one_value('# VMs')
 
     @property
     def provisioned_mb(self):
-        return int(self._search_one_value('Provisioned MB'))
+        return self._search_one_value('Provisioned MB')
 
     @property
     def sioc_enable(self):
-        return bool(self._search_one_value('SIOC enabled'))
+        return self._search_one_value('SIOC enabled')
 
     @property
     def type(self):
@@ -219,66 +275,81 @@ class DataStore(ESXBase):
     def version(self):
         return str(self._search_one_value('Major Version'))
 
+    @property
+    def vms(self):
+        if not self._vms:
+            self._vms = self._related('datastore_vms', VirtualMachine)
+
+        return self._vms
+
 
-class HBA(object):
+class HBA(RowBase):
     """ Tiny object that's represent an HBA adapter """
 
-    def __init__(self, **kwargs):
-        self._hba = kwargs
+    __slots__ = ()
+    SHEET = 'tabvHBA'
 
     def __repr__(self):
-        return 'HBA(%s)' % self._hba['Device']
+        return 'HBA(%s)' % self._value('Device')
 
     def __str__(self):
-        return self._hba['Device']
+        return self._value('Device')
 
     @property
     def device(self):
-        return self._hba['Device']
+        return self._value('Device')
 
     @property
     def status(self):
-        return self._hba['Status']
+        return self._value('Status')
 
     @property
     def type(self):
-        return self._hba['Type']
+        return self._value('Type')
 
     @property
     def driver(self):
-        return self._hba['Driver']
+        return self._value('Driver')
 
     @property
     def model(self):
-        return self._hba['Model']
+        return self._value('Model')
 
     @property
     def wwn(self):
         wwn = None
         if self.type == 'Fibre Channel':
-            wwn = self._hba['WWN'].split(' ')
+            wwn = self._value('WWN').split(' ')
         return wwn
 
 
 class Host(ESXBase):
     """ Object that's represent a vSphere DataStore """
 
-    def __init__(self, workbook: book, name: str):
+    SHEET = 'tabvHost'
+    KEY = 'Host'
+    FIELDS = {'name': 'Host', 'cluster': 'Cluster',
+              'cpu_usage_percent': 'CPU usage %',
+              'datacenter': 'Datacenter', 'esx_version': 'ESX Version',
+              'memory_mb': '# Memory',
+              'memory_usage_percent': 'Memory usage %', 'model': 'Model',
+              'number_of_cores': '# Cores', 'number_of_cpu': '# CPU',
+              'number_of_vcpu': '# vCPUs', 'number_of_vm': '# VMs'}
+
+    def __init__(self, inventory: Inventory, name: str):
         """
         Constructor
-        :param workbook: a XLRD workbook
+        :param inventory: the shared Inventory of the RVTools file
         :param name: name of that Host
         """
-        super().__init__(workbook, name)
-        self._sheet = self._book.sheet_by_name('tabvHost')
-        self._column = 'Host'
+        super().__init__(inventory, name)
+        self._datastores = []
         self._hba = []
         self._vms = []
 
     @property
     def boot_time(self):
-        date = self._search_one_value('Boot time')
-        return datetime.strptime(date, '%d/%m/%Y %H:%M:%S')
+        return self._search_one_value('Boot time')
 
     @property
     def cluster(self):
@@ -286,12 +357,19 @@ class Host(ESXBase):
 
     @property
     def cpu_usage_percent(self):
-        return int(self._search_one_value('CPU usage %'))
+        return self._search_one_value('CPU usage %')
 
     @property
     def datacenter(self):
         return self._search_one_value('Datacenter')
 
+    @property
+    def datastores(self):
+        if not self._datastores:
+            self._datastores = self._related('host_datastores', DataStore)
+
+        return self._datastores
+
     @property
     def esx_version(self):
         return self._search_one_value('ESX Version')
@@ -299,21 +377,21 @@ class Host(ESXBase):
     @property
     def hba(self):
         if not self._hba:
-            data = self._search(sheet=self._book.sheet_by_name('tabvHBA'),
-                                column='Host',
-                                target=self._name)
-            for one_hba in data:
-                self._hba.append(HBA(**one_hba))
+            rows = self._search_rows(sheet='tabvHBA',
+                                     column='Host',
+                                     target=self._name)
+            for row in rows:
+                self._hba.append(HBA(self._inventory, row))
 
         return self._hba
 
     @property
     def memory_mb(self):
-        return int(self._search_one_value('# Memory'))
+        return self._search_one_value('# Memory')
 
     @property
     def memory_usage_percent(self):
-        return int(self._search_one_value('Memory usage %'))
+        return self._search_one_value('Memory usage %')
 
     @property
     def model(self):
@@ -321,28 +399,24 @@ class Host(ESXBase):
 
     @property
     def number_of_cores(self):
-        return int(self._search_one_value('# Cores'))
+        return self._search_one_value('# Cores')
 
     @property
     def number_of_cpu(self):
-        return int(self._search_one_value('# CPU'))
+        return self._search_one_value('# CPU')
 
     @property
     def number_of_vcpu(self):
-        return int(self._search_one_value('# vCPUs'))
+        return self._search_one_value('# vCPUs')
 
     @property
     def number_of_vm(self):
-        return int(self._search_one_value('# VMs'))
+        return self._search_one_value('# VMs')
 
     @property
     def vm(self):
         if not self._vms:
-            data = self._search(sheet=self._book.sheet_by_name('tabvInfo'),
-                                column='Host',
-                                target=self._name)
-            for vm in data:
-                self._vms.append(VirtualMachine(self._book, vm['VM']))
+            self._vms = self._related('host_vms', VirtualMachine)
 
         return self._vms
 
@@ -350,47 +424,62 @@ class Host(ESXBase):
 class VirtualMachine(ESXBase):
     """ Object that's represent a vSphere Virtual Machine """
 
-    def __init__(self, workbook: book, name: str):
+    SHEET = 'tabvInfo'
+    KEY = 'VM'
+    FIELDS = {'name': 'VM', 'cluster': 'Cluster', 'cpu': 'CPUs',
+              'datacenter': 'Datacenter', 'host': 'Host',
+              'inuse_mb': 'In Use MB', 'memory': 'Memory', 'os': 'OS',
+              'power_state': 'Powerstate', 'provisioned_mb': 'Provisioned MB',
+              'unshared_mb': 'Unshared MB'}
+
+    def __init__(self, inventory: Inventory, name: str):
         """
         Constructor
-        :param workbook: a XLRD workbook
+        :param inventory: the shared Inventory of the RVTools file
         :param name: name of that VirtualMachine
         """
-        super().__init__(workbook, name)
-        self._sheet = self._book.sheet_by_name('tabvInfo')
-        self._column = 'VM'
+        super().__init__(inventory, name)
+        self._datastores = []
         self._vdisks = []
         self._vpartitions = []
         self._vnetworks = []
 
     @property
     def cluster(self):
-        return Cluster(self._book, self._search_one_value('Cluster'))
+        return self._inventory.get(Cluster, self._search_one_value('Cluster'))
 
     @property
     def cpu(self):
-        return int(self._search_one_value('CPUs'))
+        return self._search_one_value('CPUs')
 
     @property
     def datacenter(self):
-        return DataCenter(self._book, self._search_one_value('Datacenter'))
+        return self._inventory.get(DataCenter,
+                                   self._search_one_value('Datacenter'))
 
     @property
     def datastore(self):
         path = self._search_one_value('Path')
-        return DataStore(self._book, path[path.find('[')+1:path.find(']')])
+        return self._inventory.get(DataStore, datastore_name(path))
+
+    @property
+    def datastores(self):
+        if not self._datastores:
+            self._datastores = self._related('vm_datastores', DataStore)
+
+        return self._datastores
 
     @property
     def host(self):
-        return Host(self._book, self._search_one_value('Host'))
+        return self._inventory.get(Host, self._search_one_value('Host'))
 
     @property
     def inuse_mb(self):
-        return int(self._search_one_value('In Use MB'))
+        return self._search_one_value('In Use MB')
 
     @property
     def memory(self):
-        return int(self._search_one_value('Memory'))
+        return self._search_one_value('Memory')
 
     @property
     def os(self):
@@ -398,11 +487,7 @@ class VirtualMachine(ESXBase):
 
     @property
     def power_on(self):
-        timestamp = None
-        date = self._search_one_value('PowerOn')
-        if date:
-            timestamp = datetime.strptime(date, '%d/%m/%Y %H:%M:%S')
-        return timestamp
+        return self._search_one_value('PowerOn')
 
     @property
     def power_state(self):
@@ -410,154 +495,157 @@ class VirtualMachine(ESXBase):
 
     @property
     def provisioned_mb(self):
-        return int(self._search_one_value('Provisioned MB'))
+        return self._search_one_value('Provisioned MB')
 
     @property
     def unshared_mb(self):
-        return int(self._search_one_value('Unshared MB'))
+        return self._search_one_value('Unshared MB')
 
     @property
     def vmdk(self):
         if not self._vdisks:
-            data = self._search(sheet=self._book.sheet_by_name('tabvDisk'),
-                                column='VM',
-                                target=self._name)
+            rows = self._search_rows(sheet='tabvDisk',
+                                     column='VM',
+                                     target=self._name)
 
-            for disk in data:
-                self._vdisks.append(VDisk(book=self._book, **disk))
+            for row in rows:
+                self._vdisks.append(VDisk(self._inventory, row))
 
         return self._vdisks
 
     @property
     def vnetwork(self):
         if not self._vnetworks:
-            data = self._search(sheet=self._book.sheet_by_name('tabvNetwork'),
-                                column='VM',
-                                target=self._name)
+            rows = self._search_rows(sheet='tabvNetwork',
+                                     column='VM',
+                                     target=self._name)
 
-            for network in data:
-                self._vnetworks.append(VNetwork(**network))
+            for row in rows:
+                self._vnetworks.append(VNetwork(self._inventory, row))
 
         return self._vnetworks
 
     @property
     def vpartition(self):
         if not self._vpartitions:
-            data = self._search(sheet=self._book.sheet_by_name('tabvPartition'),
-                                column='VM',
-                                target=self._name)
+            rows = self._search_rows(sheet='tabvPartition',
+                                     column='VM',
+                                     target=self._name)
 
-            for disk in data:
-                self._vpartitions.append(VPartition(**disk))
+            for row in rows:
+                self._vpartitions.append(VPartition(self._inventory, row))
 
         return self._vpartitions
 
 
-class VDisk(object):
+class VDisk(RowBase):
     """ Tiny object that's represent a VMDK disk """
 
-    def __init__(self, **kwargs):
-        self._data = kwargs
-        self._book = kwargs['book']
+    __slots__ = ()
+    SHEET = 'tabvDisk'
 
     def __repr__(self):
-        return 'VMDK(%s)' % self._data['Disk']
+        return 'VMDK(%s)' % self._value('Disk')
 
     def __str__(self):
-        return self._data['Disk']
+        return self._value('Disk')
 
     @property
     def capacity_mb(self):
-        return int(self._data['Capacity MB'])
+        return self._value('Capacity MB')
 
     @property
     def datastore(self):
-        path = self._data['Path']
-        return DataStore(self._book, path[path.find('[')+1:path.find(']')])
+        path = self._value('Path')
+        return self._inventory.get(DataStore, datastore_name(path))
 
     @property
     def eagerly_scrub(self):
-        return bool(self._data['Eagerly Scrub'])
+        return self._value('Eagerly Scrub')
 
     @property
     def thin(self):
-        return bool(self._data['Thin'])
+        return self._value('Thin')
 
 
-class VNetwork(object):
+class VNetwork(RowBase):
     """ Tiny object that's represent a virtual network adapter """
 
-    def __init__(self, **kwargs):
-        self._data = kwargs
+    __slots__ = ()
+    SHEET = 'tabvNetwork'
 
     def __repr__(self):
-        return 'VNetwork(%s,%s,%s)' % (self._data['VM'],
-                                       self._data['Adapter'],
-                                       self._data['Network'])
+        return 'VNetwork(%s,%s,%s)' % (self._value('VM'),
+                                       self._value('Adapter'),
+                                       self._value('Network'))
 
     def __str__(self):
-        return '%s,%s,%s' % (self._data['VM'],
-                             self._data['Adapter'],
-                             self._data['Network'])
+        return '%s,%s,%s' % (self._value('VM'),
+                             self._value('Adapter'),
+                             self._value('Network'))
 
     @property
     def adapter(self):
-        return self._data['Adapter']
+        return self._value('Adapter')
 
     @property
     def connected(self):
-        return bool(self._data['Connected'])
+        return self._value('Connected')
 
     @property
     def ip_address(self):
-        ip = []
-        if self._data['IP Address']:
-            if not self._data['IP Address'] == 'unknown':
-                ip = self._data['IP Address'].split(', ')
-
-        return ip
+        return list(self._value('IP Address'))
 
     @property
     def mac_address(self):
-        return self._data['Mac Address']
+        return self._value('Mac Address')
 
     @property
     def network(self):
-        return self._data['Network'] if self._data['Network'] else None
+        network = self._value('Network')
+        return network if network else None
 
     @property
     def powerstate(self):
-        return self._data['Powerstate']
+        return self._value('Powerstate')
 
     @property
     def switch(self):
-        return self._data['Switch']
+        return self._value('Switch')
+
+    @property
+    def vm(self):
+        return self._inventory.get(VirtualMachine, self._value('VM'))
 
 
-class VPartition(object):
+class VPartition(RowBase):
     """ Tiny object that's represent the data (partitions) inside a VM """
 
-    def __init__(self, **kwargs):
-        self._data = kwargs
+    __slots__ = ()
+    SHEET = 'tabvPartition'
 
     def __repr__(self):
-        return 'VPartition(%s)' % self._data['Disk']
+        return 'VPartition(%s)' % self._value('Disk')
 
     def __str__(self):
-        return self._data['Disk']
+        return self._value('Disk')
 
     @property
     def capacity_mb(self):
-        return int(self._data['Capacity MB'])
+        return self._value('Capacity MB')
 
     @property
     def disk(self):
-        return self._data['Disk']
+        return self._value('Disk')
 
     @property
     def free_mb(self):
-        return int(self._data['Free MB'])
+        return self._value('Free MB')
 
     @property
     def free_percent(self):
-        return int(self._data['Free % '])
+        """ Free space in percent, from the sizes when the cell is empty """
+        value = self._value('Free % ')
+        if value is None:
+            value = percent(self.free_mb, self.capacity_mb)
+        return value
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# coding : utf-8
+
+import csv
+import os
+from array import array
+from pyrvtools.errors import PyRvtoolsError
+from pyrvtools.inventory import Inventory
+from pyrvtools.schema import SHEETS, TYPES, decode
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+EXTENSIONS = {
+    'arrow': '.arrow',
+    'csv': '.csv',
+    'parquet': '.parquet',
+}
+
+
+def _batches(inventory: Inventory, name: str, batch_size: int):
+    """
+    Generator - Return the typed columns of a sheet, batch_size rows at a
+    time
+    :return dict: a dictionary with COLUMN_NAME:[VALUES]
+    """
+    sheet = inventory.sheet(name)
+    for start in range(0, sheet.nrows, batch_size):
+        stop = min(start + batch_size, sheet.nrows)
+        batch = {}
+        for column, values in sheet.columns.items():
+            if column in TYPES:
+                batch[column] = [decode(column, value)
+                                 for value in values[start:stop]]
+            elif isinstance(values, array):
+                batch[column] = values[start:stop].tolist()
+            else:
+                batch[column] = [value if isinstance(value, str) else
+                                 str(value) for value in values[start:stop]]
+        yield batch
+
+
+def _csv_value(value):
+    if isinstance(value, list):
+        return ', '.join(value)
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        return value.isoformat(sep=' ')
+    return value
+
+
+def _write_csv(path: str, columns: list, batches):
+    with open(path, 'w', newline='') as fh:
+        writer = csv.writer(fh)
+        writer.writerow(columns)
+        for batch in batches:
+            writer.writerows(zip(*(map(_csv_value, batch[column])
+                                   for column in columns)))
+
+
+def _arrow_schema(inventory: Inventory, name: str):
+    """ Arrow schema of a sheet, from the type of its columns """
+    arrow_types = {
+        'bool': pyarrow.bool_(),
+        'datetime': pyarrow.timestamp('s'),
+        'int': pyarrow.int64(),
+        'list': pyarrow.list_(pyarrow.string()),
+    }
+    fields = []
+    for column, values in inventory.sheet(name).columns.items():
+        if column in TYPES:
+            arrow_type = arrow_types[TYPES[column]]
+        elif isinstance(values, array):
+            arrow_type = pyarrow.float64()
+        else:
+            arrow_type = pyarrow.string()
+        fields.append(pyarrow.field(column, arrow_type))
+    return pyarrow.schema(fields)
+
+
+def _write_arrow(path: str, schema, batches, fmt: str):
+    if fmt == 'parquet':
+        writer = pyarrow.parquet.ParquetWriter(path, schema)
+    else:
+        writer = pyarrow.ipc.new_file(path, schema)
+    with writer:
+        for batch in batches:
+            table = pyarrow.Table.from_pydict(batch, schema=schema)
+            writer.write_table(table)
+
+
+def export(inventory: Inventory, directory: str, fmt='csv', sheets=None,
+           batch_size=10000):
+    """
+    Write the sheets of an inventory, one file per sheet (SHEET.EXT)
+    :param inventory: the Inventory of the RVTools file
+    :param directory: destination directory
+    :param fmt: 'csv', 'parquet' or 'arrow' (Arrow IPC file)
+    :param sheets: names of the sheets to export (default: all the known
+                   sheets of the file)
+    :param batch_size: number of rows converted at a time
+    :return list: the paths of the written files
+    """
+    if fmt not in EXTENSIONS:
+        raise PyRvtoolsError('Unknown export format: %s' % fmt)
+    if fmt != 'csv' and pyarrow is None:
+        raise PyRvtoolsError('pyarrow is needed to export in %s format' % fmt)
+
+    if sheets is None:
+        sheets = [name for name in inventory.sheet_names() if name in SHEETS]
+
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for name in sheets:
+        path = os.path.join(directory, name + EXTENSIONS[fmt])
+        batches = _batches(inventory, name, batch_size)
+        if fmt == 'csv':
+            _write_csv(path, list(inventory.sheet(name).columns), batches)
+        else:
+            _write_arrow(path, _arrow_schema(inventory, name), batches, fmt)
+        paths.append(path)
+    return paths
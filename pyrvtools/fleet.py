@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# coding : utf-8
+
+import itertools
+import pyrvtools.pyrvtools
+from concurrent.futures import ProcessPoolExecutor
+from pyrvtools.aggregate import Capacity
+from pyrvtools.inventory import Inventory
+from pyrvtools.readers import MemoryReader, open_reader
+
+
+def parse(filename: str):
+    """
+    Parse every known sheet of an RVTools file (run in a worker process)
+    :param filename: RVTools inventory file
+    :return MemoryReader: a picklable reader over the parsed sheets
+    """
+    inventory = Inventory(open_reader(filename))
+    sheets = {name: sheet.columns
+              for name, sheet in inventory.sheets().items()}
+    return MemoryReader(filename, sheets, inventory.sheet_names())
+
+
+class Fleet(object):
+    """ Merged view of several RVTools files (usually one per vCenter) """
+
+    def __init__(self, members: list):
+        """
+        Constructor
+        :param members: a list of PyRvtools objects
+        """
+        self._members = list(members)
+
+    def __iter__(self):
+        return iter(self._members)
+
+    def __len__(self):
+        return len(self._members)
+
+    def __repr__(self):
+        return 'Fleet(%s)' % ', '.join(member.filename
+                                       for member in self._members)
+
+    @classmethod
+    def load(cls, filenames, workers=None):
+        """
+        Parse RVTools files in a pool of processes
+        :param filenames: an iterable of RVTools inventory files
+        :param workers: number of processes (default: number of CPUs)
+        :return Fleet
+        """
+        filenames = list(filenames)
+        if workers == 1 or len(filenames) < 2:
+            readers = [parse(filename) for filename in filenames]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                readers = list(pool.map(parse, filenames))
+
+        return cls(pyrvtools.pyrvtools.PyRvtools(reader.filename,
+                                                 reader=reader)
+                   for reader in readers)
+
+    @property
+    def members(self):
+        return self._members
+
+    def aggregate(self, by='cluster'):
+        """
+        Capacity figures of every file, see PyRvtools.aggregate
+        :param by: 'datacenter', 'cluster', 'host' or 'datastore'
+        :return dict: a dictionary with (VCENTER, GROUP_NAME):Capacity
+        """
+        totals = {}
+        for member in self._members:
+            for group, capacity in member.aggregate(by=by).items():
+                key = (member.vcenter, group)
+                if key in totals:
+                    capacity = Capacity(*map(sum, zip(totals[key], capacity)))
+                totals[key] = capacity
+        return totals
+
+    def get_clusters(self):
+        """
+        Generator - return the Cluster objects of every file
+        :return Cluster
+        """
+        return itertools.chain.from_iterable(
+            member.get_clusters() for member in self._members)
+
+    def get_datacenters(self):
+        """
+        Generator - return the DataCenter objects of every file
+        :return DataCenter
+        """
+        return itertools.chain.from_iterable(
+            member.get_datacenters() for member in self._members)
+
+    def get_datastores(self):
+        """
+        Generator - return the DataStore objects of every file
+        :return DataStore
+        """
+        return itertools.chain.from_iterable(
+            member.get_datastores() for member in self._members)
+
+    def get_hosts(self):
+        """
+        Generator - return the Host objects of every file
+        :return Host
+        """
+        return itertools.chain.from_iterable(
+            member.get_hosts() for member in self._members)
+
+    def get_vm(self):
+        """
+        Generator - return the VirtualMachine objects of every file
+        :return VirtualMachine
+        """
+        return itertools.chain.from_iterable(
+            member.get_vm() for member in self._members)
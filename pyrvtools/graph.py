@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# coding : utf-8
+
+from pyrvtools.errors import PyRvtoolsError
+from pyrvtools.schema import datastore_name, decode
+
+
+# Relations read from two columns of a sheet: (sheet, parent, child)
+COLUMNS = {
+    'datacenter_clusters': ('tabvHost', 'Datacenter', 'Cluster'),
+    'datacenter_hosts': ('tabvHost', 'Datacenter', 'Host'),
+    'cluster_hosts': ('tabvHost', 'Cluster', 'Host'),
+    'host_vms': ('tabvInfo', 'Host', 'VM'),
+}
+
+# Relations built as the reverse of another one
+REVERSES = {
+    'host_datastores': 'datastore_hosts',
+    'datastore_vms': 'vm_datastores',
+}
+
+
+# Sheets read by each relation
+SHEETS = {
+    'datacenter_clusters': ('tabvHost',),
+    'datacenter_hosts': ('tabvHost',),
+    'cluster_hosts': ('tabvHost',),
+    'host_vms': ('tabvInfo',),
+    'host_datastores': ('tabvDatastore',),
+    'datastore_hosts': ('tabvDatastore',),
+    'datastore_vms': ('tabvInfo', 'tabvDisk'),
+    'vm_datastores': ('tabvInfo', 'tabvDisk'),
+}
+
+
+class Graph(object):
+    """
+    Relationships between the objects of an inventory, as adjacency lists
+    (NAME:[RELATED NAMES]) built once per relation on first use
+    """
+
+    def __init__(self, inventory):
+        """
+        Constructor
+        :param inventory: the shared Inventory of the RVTools file
+        """
+        self._inventory = inventory
+        self._relations = {}
+
+    def _pairs(self, name: str):
+        """
+        Generator - Return the (parent, child) names of a relation
+        :param name: Name of the relation
+        """
+        if name in COLUMNS:
+            sheet_name, parent, child = COLUMNS[name]
+            sheet = self._inventory.sheet(sheet_name)
+            yield from zip(sheet.column(parent), sheet.column(child))
+
+        elif name in REVERSES:
+            for parent, child in self._pairs(REVERSES[name]):
+                yield child, parent
+
+        elif name == 'datastore_hosts':
+            datastores = self._inventory.sheet('tabvDatastore')
+            for datastore, hosts in zip(datastores.column('Name'),
+                                        datastores.column('Hosts')):
+                for host in decode('Hosts', hosts):
+                    yield datastore, host
+
+        elif name == 'vm_datastores':
+            for sheet_name in ('tabvInfo', 'tabvDisk'):
+                sheet = self._inventory.sheet(sheet_name)
+                for vm, path in zip(sheet.column('VM'), sheet.column('Path')):
+                    yield vm, datastore_name(path)
+
+        else:
+            raise PyRvtoolsError('Unknown relation: %s' % name)
+
+    def relation(self, name: str):
+        """
+        Return (and build once) the adjacency lists of a relation
+        :param name: Name of the relation (ex: 'cluster_hosts')
+        :return dict: a dictionary with NAME:[RELATED NAMES]
+        """
+        if name not in self._relations:
+            adjacency = {}
+            for parent_name, child_name in self._pairs(name):
+                if parent_name and child_name:
+                    adjacency.setdefault(parent_name, {})[child_name] = None
+            self._relations[name] = {parent_name: list(children)
+                                     for parent_name, children
+                                     in adjacency.items()}
+        return self._relations[name]
+
+    def invalidate(self, sheet_names):
+        """
+        Forget the relations read from some sheets (built again on use)
+        :param sheet_names: names of the changed sheets
+        """
+        for name in list(self._relations):
+            if set(SHEETS[name]) & set(sheet_names):
+                del self._relations[name]
+
+    def related(self, name: str, key: str):
+        """
+        Return the names related to one object
+        :param name: Name of the relation (ex: 'datastore_vms')
+        :param key: Name of the object (ex: name of the DataStore)
+        :return list: a list of names
+        """
+        return self.relation(name).get(key, [])
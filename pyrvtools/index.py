@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# coding : utf-8
+
+import sys
+from array import array
+from bisect import insort
+from pyrvtools.schema import decode
+
+# Value of the rows not decoded yet
+_UNDECODED = object()
+
+
+def make_column(values, numeric: bool):
+    """
+    Return the compact in-memory form of a column
+    :param values: values of the column (header excluded)
+    :param numeric: (boolean) every value of the column is a number
+    :return: an array of doubles (numeric) or a list of interned values
+    """
+    if numeric:
+        return array('d', values)
+    return [sys.intern(value) if isinstance(value, str) else value
+            for value in values]
+
+
+class SheetIndex(object):
+    """ Columnar copy of a sheet, with hash indexes on key columns """
+
+    def __init__(self, columns: dict, indexes=None, name=''):
+        """
+        Constructor
+        :param columns: a dictionary with COLUMN_NAME:COLUMN_VALUES
+        :param indexes: prebuilt indexes, dictionary with COLUMN_NAME:INDEX
+        :param name: Name of the sheet (used by the stats)
+        """
+        self._columns = columns
+        self._nrows = max((len(values) for values in columns.values()),
+                          default=0)
+        self._indexes = dict(indexes or {})
+        self._typed = {}
+        self._memory_size = None
+        self.name = name
+        # Stats of the inventory, None when the instrumentation is disabled
+        self.stats = None
+
+    def _scanned(self, column: str):
+        """ Count a whole column read """
+        key = '%s.%s' % (self.name, column)
+        self.stats.count('scans', key)
+        self.stats.count('cells', key, self._nrows)
+
+    @property
+    def columns(self):
+        """ Dictionary with COLUMN_NAME:COLUMN_VALUES """
+        return self._columns
+
+    @property
+    def indexes(self):
+        """ Hash indexes built so far, dictionary with COLUMN_NAME:INDEX """
+        return self._indexes
+
+    @property
+    def memory_size(self):
+        """
+        Approximate size of the columns in bytes (a value shared by several
+        rows is counted once), computed on first use
+        """
+        if self._memory_size is None:
+            size = 0
+            for values in self._columns.values():
+                size += sys.getsizeof(values)
+                if not isinstance(values, array):
+                    size += sum(map(sys.getsizeof, set(values)))
+            self._memory_size = size
+        return self._memory_size
+
+    @property
+    def nrows(self):
+        """ Number of rows (header excluded) """
+        return self._nrows
+
+    def index(self, column: str):
+        """
+        Build (once) and return the hash index of a column
+        :param column: Name of the column to index
+        :return dict: a dictionary with VALUE:[ROW_OFFSETS]
+        """
+        if column not in self._indexes:
+            if self.stats is not None:
+                self.stats.count('index_builds',
+                                 '%s.%s' % (self.name, column))
+                self._scanned(column)
+            index = {}
+            for offset, value in enumerate(self._columns[column]):
+                index.setdefault(value, []).append(offset)
+            self._indexes[column] = index
+        return self._indexes[column]
+
+    def column(self, column: str):
+        """
+        Return every value of a column (header excluded)
+        :param column: Name of the column
+        """
+        if self.stats is not None:
+            self._scanned(column)
+        return self._columns[column]
+
+    def column_values(self, column: str):
+        """
+        Generator - Return every value of a column (header excluded)
+        :param column: Name of the column
+        """
+        if self.stats is not None:
+            self._scanned(column)
+        yield from self._columns[column]
+
+    def find(self, column: str, target):
+        """
+        Return the offsets of the rows where column == target
+        :param column: Name of the column where perform the search
+        :param target: Value to find
+        :return list: a list of row offsets
+        """
+        offsets = self.index(column).get(target, [])
+        if self.stats is not None:
+            self.stats.count('index_hits' if offsets else 'index_misses',
+                             '%s.%s' % (self.name, column))
+        return offsets
+
+    def row(self, offset: int):
+        """
+        Return a complete row of data
+        :param offset: offset of the row
+        :return dict: a dictionary with COLUMN_NAME:VALUE
+        """
+        if self.stats is not None:
+            for column in self._columns:
+                self.stats.count('cells', '%s.%s' % (self.name, column))
+        return {col_name: values[offset]
+                for col_name, values in self._columns.items()}
+
+    def value(self, offset: int, column: str):
+        """
+        Return one value of a row
+        :param offset: offset of the row
+        :param column: Name of the column
+        """
+        if self.stats is not None:
+            self.stats.count('cells', '%s.%s' % (self.name, column))
+        return self._columns[column][offset]
+
+    def update(self, columns: dict):
+        """
+        Replace the columns by the ones of a new version of the sheet. When
+        the rows are the same, only the indexes and the decoded values of
+        the changed rows are patched, otherwise they are built again on
+        demand
+        :param columns: a dictionary with COLUMN_NAME:COLUMN_VALUES
+        :return list: offsets of the changed rows (None: rows were added,
+                      removed or moved)
+        """
+        nrows = max((len(values) for values in columns.values()), default=0)
+        if nrows != self._nrows or set(columns) != set(self._columns):
+            self._columns = columns
+            self._nrows = nrows
+            self._indexes = {}
+            self._typed = {}
+            self._memory_size = None
+            return None
+
+        names = list(self._columns)
+        old_rows = zip(*(self._columns[name] for name in names))
+        new_rows = zip(*(columns[name] for name in names))
+        changed = [offset for offset, (old, new)
+                   in enumerate(zip(old_rows, new_rows)) if old != new]
+
+        for column, index in self._indexes.items():
+            old_values, new_values = self._columns[column], columns[column]
+            for offset in changed:
+                old_value, new_value = old_values[offset], new_values[offset]
+                if old_value == new_value:
+                    continue
+                rows = index[old_value]
+                rows.remove(offset)
+                if not rows:
+                    del index[old_value]
+                insort(index.setdefault(new_value, []), offset)
+        for values in self._typed.values():
+            for offset in changed:
+                values[offset] = _UNDECODED
+
+        self._columns = columns
+        self._memory_size = None
+        return changed
+
+    def typed_value(self, offset: int, column: str):
+        """
+        Return one value of a row converted to the type of its column (see
+        schema.TYPES), each cell is converted only once
+        :param offset: offset of the row
+        :param column: Name of the column
+        """
+        if self.stats is not None:
+            self.stats.count('cells', '%s.%s' % (self.name, column))
+        values = self._typed.get(column)
+        if values is None:
+            values = self._typed[column] = [_UNDECODED] * self._nrows
+        value = values[offset]
+        if value is _UNDECODED:
+            value = values[offset] = decode(column,
+                                            self._columns[column][offset])
+        return value
+
+    def typed_column(self, column: str):
+        """
+        Return every value of a column converted to the type of the column
+        (see schema.TYPES), each cell is converted only once
+        :param column: Name of the column
+        """
+        if self.stats is not None:
+            self._scanned(column)
+        values = self._typed.get(column)
+        if values is None:
+            values = self._typed[column] = [
+                decode(column, value) for value in self._columns[column]]
+        elif _UNDECODED in values:
+            raw = self._columns[column]
+            for offset, value in enumerate(values):
+                if value is _UNDECODED:
+                    values[offset] = decode(column, raw[offset])
+        return values
+
+    def search(self, column: str, target, only_one=False):
+        """
+        Search rows by value through the index of a column
+        :param column: Name of the column where perform the search
+        :param target: Value to find
+        :param only_one: (boolean) search one (true) or multiple values (false)
+        :return list: a list of dictionaries with a complete row of data
+        """
+        offsets = self.find(column, target)
+        if only_one:
+            offsets = offsets[:1]
+        return [self.row(offset) for offset in offsets]
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+# coding : utf-8
+
+import threading
+from collections import OrderedDict
+from pyrvtools.graph import Graph
+from pyrvtools.index import SheetIndex
+from pyrvtools.readers import Reader
+from pyrvtools.schema import (KEYS, SHEETS, datastore_name, decode,
+                              rename_columns, sheet_columns)
+from pyrvtools.validate import DEPENDENCIES, check_columns, validate
+
+
+def _row_keys(name: str, columns: dict, offsets):
+    """
+    Generator - Return the names of the objects found in some rows of a
+    sheet (key columns, datastores of the paths, hosts of the datastores)
+    """
+    for column in KEYS.get(name, ()):
+        if column in columns:
+            yield from (columns[column][offset] for offset in offsets)
+    if 'Path' in columns:
+        yield from (datastore_name(columns['Path'][offset])
+                    for offset in offsets)
+    if name == 'tabvDatastore' and 'Hosts' in columns:
+        for offset in offsets:
+            yield from decode('Hosts', columns['Hosts'][offset])
+
+
+class Inventory(object):
+    """ Shared context of an RVTools file (sheets, indexes and objects) """
+
+    def __init__(self, reader: Reader, memory_budget=None,
+                 keep_indexes=False):
+        """
+        Constructor
+        :param reader: the Reader of the RVTools file
+        :param memory_budget: approximate size in bytes of the loaded
+                              sheets, the least recently used ones are
+                              unloaded above it (None: no limit)
+        :param keep_indexes: (boolean) keep the hash indexes of the
+                             unloaded sheets, they are not built again
+                             when the sheet is reloaded
+        """
+        self._reader = reader
+        self._sheets = OrderedDict()
+        self._memory_budget = memory_budget
+        self._keep_indexes = keep_indexes
+        self._kept_indexes = {}
+        self._pinned = set()
+        self._unchecked = set()
+        self._fingerprints = {}
+        # Sheets are parsed by one thread at a time, the loaded ones are
+        # read without lock
+        self._lock = threading.RLock()
+        self._objects = {}
+        self._graph = None
+        self._vcenter = None
+        self._stats = None
+
+    @property
+    def filename(self):
+        """ Name of the RVTools file """
+        return self._reader.filename
+
+    @property
+    def graph(self):
+        """ Relationship graph of the objects (see Graph) """
+        if self._graph is None:
+            self._graph = Graph(self)
+        return self._graph
+
+    @property
+    def stats(self):
+        """ Stats of the work done on that inventory (None: disabled) """
+        return self._stats
+
+    @stats.setter
+    def stats(self, stats):
+        self._stats = stats
+        for sheet in self._sheets.values():
+            sheet.stats = stats
+
+    @property
+    def vcenter(self):
+        """ Name of the vCenter exported in that file ('VI SDK Server') """
+        if self._vcenter is None:
+            self._vcenter = ''
+            for name in ('tabvInfo', 'tabvHost'):
+                if name not in self.sheet_names():
+                    continue
+                sheet = self.sheet(name)
+                if 'VI SDK Server' not in sheet.columns:
+                    continue
+                servers = sheet.column('VI SDK Server')
+                self._vcenter = next((value for value in servers if value), '')
+                if self._vcenter:
+                    break
+        return self._vcenter
+
+    def get(self, cls, name: str):
+        """
+        Identity map - return the unique object of that class and name
+        :param cls: class of the ESX object (Host, Cluster, ...)
+        :param name: name of the ESX object
+        """
+        key = (cls, name)
+        obj = self._objects.get(key)
+        if obj is None:
+            with self._lock:
+                obj = self._objects.get(key)
+                if obj is None:
+                    obj = self._objects[key] = cls(self, name)
+                    if self._stats is not None:
+                        self._stats.count('objects_created', cls.__name__)
+                    return obj
+        if self._stats is not None:
+            self._stats.count('objects_reused', cls.__name__)
+        return obj
+
+    def sheet(self, name: str):
+        """
+        Return the SheetIndex of a sheet, the sheet is parsed only once
+        (unless it is unloaded)
+        :param name: Name of the sheet
+        """
+        sheet = self._sheets.get(name)
+        if sheet is None:
+            with self._lock:
+                sheet = self._sheets.get(name)
+                if sheet is None:
+                    sheet = self._load_sheet(name)
+        elif self._memory_budget is not None:
+            try:
+                self._sheets.move_to_end(name)
+            except KeyError:
+                pass  # unloaded by another thread meanwhile
+        return sheet
+
+    def _load_sheet(self, name: str):
+        """ Parse a sheet, register it and apply the memory budget """
+        if self._stats is None:
+            sheet = self._load(name)
+        else:
+            with self._stats.timer('load_seconds', name):
+                sheet = self._load(name)
+            self._stats.count('sheet_loads', name)
+        sheet.stats = self._stats
+        self._sheets[name] = sheet
+        if self._memory_budget is not None:
+            self._enforce_budget(name)
+        return sheet
+
+    def _load(self, name: str):
+        """ Parse a sheet and return its SheetIndex """
+        self._fingerprints[name] = self._reader.fingerprint(name)
+        columns = self._read_columns(name)
+        indexes = self._reader.read_indexes(name)
+        indexes.update(self._kept_indexes.pop(name, {}))
+        return SheetIndex(columns, indexes, name=name)
+
+    def _read_columns(self, name: str):
+        """ Read the columns of a sheet (and check them if needed) """
+        columns = rename_columns(
+            name, self._reader.read_sheet(name, sheet_columns(name)))
+        if name in self._unchecked:
+            check_columns(self.filename, name, columns)
+            self._unchecked.discard(name)
+        return columns
+
+    def _enforce_budget(self, current: str):
+        """
+        Unload the least recently used sheets (except the pinned ones and
+        the current one) until the loaded sheets fit in the memory budget
+        :param current: Name of the sheet being used
+        """
+        size = self.memory_size()
+        for name in list(self._sheets):
+            if size <= self._memory_budget:
+                break
+            if name == current or name in self._pinned:
+                continue
+            size -= self._sheets[name].memory_size
+            self.unload(name)
+
+    def reload(self, reader: Reader):
+        """
+        Switch to a new export of the same vCenter. The unchanged sheets
+        (same fingerprint) are not read, the changed rows of the loaded
+        sheets are patched in place and only the objects using them are
+        refreshed: the existing objects stay valid
+        :param reader: the Reader of the new RVTools file
+        :return dict: a dictionary with SHEET_NAME:CHANGED_ROWS (offsets
+                      of the changed rows, None when rows were added or
+                      removed)
+        """
+        unchecked = set(validate(reader))
+        names = set(reader.sheet_names())
+        changes = {}
+        with self._lock:
+            self._reader = reader
+            self._unchecked = unchecked
+            for name in list(self._fingerprints):
+                fingerprint = reader.fingerprint(name) if name in names \
+                    else None
+                if (fingerprint is not None and
+                        fingerprint == self._fingerprints[name]):
+                    self._unchecked.discard(name)
+                    continue
+
+                sheet = self._sheets.get(name)
+                self._kept_indexes.pop(name, None)
+                if sheet is None or name not in names:
+                    # not loaded (or gone), read on next use
+                    self._sheets.pop(name, None)
+                    del self._fingerprints[name]
+                    changes[name] = None
+                    self._refresh(name, None, None, None)
+                    continue
+
+                old_columns = sheet.columns
+                changed = sheet.update(self._read_columns(name))
+                self._fingerprints[name] = fingerprint
+                if changed is None or changed:
+                    changes[name] = changed
+                    self._refresh(name, changed, old_columns, sheet.columns)
+
+            if self._memory_budget is not None:
+                self._enforce_budget(None)
+        if changes:
+            if self._graph is not None:
+                self._graph.invalidate(changes)
+            if set(changes) & {'tabvInfo', 'tabvHost'}:
+                self._vcenter = None
+        return changes
+
+    def _refresh(self, name: str, changed, old_columns, new_columns):
+        """
+        Refresh the objects using the changed rows of a sheet
+        :param name: Name of the sheet
+        :param changed: offsets of the changed rows (None: every row)
+        :param old_columns: columns of the previous version of the sheet
+        :param new_columns: columns of the new version of the sheet
+        """
+        keys = None
+        if changed is not None:
+            keys = set()
+            for columns in (old_columns, new_columns):
+                keys.update(_row_keys(name, columns, changed))
+
+        for (cls, object_name), one in self._objects.items():
+            if name not in DEPENDENCIES.get(cls.__name__, ()):
+                continue
+            if keys is None or object_name in keys:
+                one.refresh()
+
+    def validate(self):
+        """
+        Check the tabs and the header rows of the file (see validate), the
+        headers the reader can't read alone are checked when their sheet
+        is loaded
+        """
+        self._unchecked = set(validate(self._reader))
+
+    def loaded(self):
+        """
+        Return the names of the loaded sheets (least recently used first
+        when there is a memory budget)
+        """
+        return list(self._sheets)
+
+    def memory_size(self):
+        """ Approximate size in bytes of the loaded sheets """
+        return sum(sheet.memory_size for sheet in self._sheets.values())
+
+    def pin(self, name: str):
+        """
+        Never unload a sheet to respect the memory budget (it is loaded now)
+        :param name: Name of the sheet
+        """
+        self._pinned.add(name)
+        self.sheet(name)
+
+    def unpin(self, name: str):
+        """
+        Allow the unloading of a sheet pinned before
+        :param name: Name of the sheet
+        """
+        self._pinned.discard(name)
+
+    def unload(self, name: str, keep_indexes=None):
+        """
+        Free the memory of a loaded sheet, it is parsed again on next use
+        :param name: Name of the sheet
+        :param keep_indexes: (boolean) keep its hash indexes (default: the
+                             keep_indexes of the Inventory)
+        """
+        with self._lock:
+            sheet = self._sheets.pop(name, None)
+        if sheet is None:
+            return
+        if self._keep_indexes if keep_indexes is None else keep_indexes:
+            self._kept_indexes[name] = sheet.indexes
+        if self._stats is not None:
+            self._stats.count('sheet_unloads', name)
+
+    def sheet_names(self):
+        """ Return the names of the sheets of the RVTools file """
+        return self._reader.sheet_names()
+
+    def sheets(self):
+        """
+        Load every known sheet of the file
+        :return dict: a dictionary with SHEET_NAME:SheetIndex
+        """
+        return {name: self.sheet(name) for name in self.sheet_names()
+                if name in SHEETS}
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# coding : utf-8
+
+import ipaddress
+from bisect import bisect_left, bisect_right
+from pyrvtools.esx_types import VNetwork
+from pyrvtools.inventory import Inventory
+
+
+class NetworkIndex(object):
+    """
+    Reverse index of the virtual network adapters (tabvNetwork) by IP
+    address, MAC address, network and switch. The IP addresses are also
+    kept in sorted lists of integers (one per IP version) to answer
+    subnet queries with two binary searches.
+    """
+
+    def __init__(self, inventory: Inventory):
+        """
+        Constructor
+        :param inventory: the shared Inventory of the RVTools file
+        """
+        self._inventory = inventory
+        sheet = inventory.sheet(VNetwork.SHEET)
+        self._ips = {}
+        self._macs = {}
+        self._ranges = {4: ([], []), 6: ([], [])}
+
+        addresses = []
+        columns = zip(sheet.column('IP Address'),
+                      sheet.column('Mac Address'))
+        for row, (ips, mac) in enumerate(columns):
+            if mac:
+                self._macs.setdefault(mac.lower(), []).append(row)
+            if not ips or ips == 'unknown':
+                continue
+            for ip in ips.split(', '):
+                try:
+                    address = ipaddress.ip_address(ip.strip())
+                except ValueError:
+                    continue
+                self._ips.setdefault(address, []).append(row)
+                addresses.append((address.version, int(address), row))
+
+        for version, number, row in sorted(addresses):
+            numbers, rows = self._ranges[version]
+            numbers.append(number)
+            rows.append(row)
+
+    def _adapters(self, rows):
+        """ Return the VNetwork objects of some rows (without duplicates) """
+        return [VNetwork(self._inventory, row) for row in dict.fromkeys(rows)]
+
+    def by_ip(self, ip: str):
+        """
+        Return the network adapters owning an IP address
+        :param ip: IPv4 or IPv6 address
+        :return list: a list of VNetwork
+        """
+        try:
+            address = ipaddress.ip_address(ip)
+        except ValueError:
+            return []
+        return self._adapters(self._ips.get(address, []))
+
+    def by_mac(self, mac: str):
+        """
+        Return the network adapters with a MAC address (case insensitive)
+        :param mac: MAC address (ex: 00:50:56:aa:bb:cc)
+        :return list: a list of VNetwork
+        """
+        return self._adapters(self._macs.get(mac.lower(), []))
+
+    def in_subnet(self, cidr: str):
+        """
+        Return the network adapters with an IP address inside a subnet
+        :param cidr: subnet (ex: 10.1.2.0/24)
+        :return list: a list of VNetwork
+        """
+        network = ipaddress.ip_network(cidr, strict=False)
+        numbers, rows = self._ranges[network.version]
+        start = bisect_left(numbers, int(network.network_address))
+        stop = bisect_right(numbers, int(network.broadcast_address))
+        return self._adapters(rows[start:stop])
+
+    def on_network(self, name: str):
+        """
+        Return the network adapters connected to a network (port group)
+        :param name: name of the network
+        :return list: a list of VNetwork
+        """
+        sheet = self._inventory.sheet(VNetwork.SHEET)
+        return self._adapters(sheet.find('Network', name))
+
+    def on_switch(self, name: str):
+        """
+        Return the network adapters connected to a virtual switch
+        :param name: name of the switch
+        :return list: a list of VNetwork
+        """
+        sheet = self._inventory.sheet(VNetwork.SHEET)
+        return self._adapters(sheet.find('Switch', name))
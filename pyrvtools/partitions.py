@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# coding : utf-8
+
+import heapq
+from collections import namedtuple
+from operator import itemgetter
+from pyrvtools.errors import PyRvtoolsError
+from pyrvtools.esx_types import VPartition
+from pyrvtools.inventory import Inventory
+from pyrvtools.schema import number, percent
+
+# Column of tabvInfo giving the group of a VM (None: the VM itself)
+GROUPS = {
+    'vm': None,
+    'host': 'Host',
+    'cluster': 'Cluster',
+    'datacenter': 'Datacenter',
+}
+
+FIELDS = ('partitions', 'capacity_mb', 'free_mb', 'low_partitions',
+          'min_free_percent')
+PARTITIONS, CAPACITY, FREE, LOW, MIN_FREE = range(len(FIELDS))
+
+
+class GuestCapacity(namedtuple('GuestCapacity', FIELDS)):
+    """ Capacity figures of the guest filesystems of a group of VMs """
+
+    __slots__ = ()
+
+    @property
+    def used_mb(self):
+        return self.capacity_mb - self.free_mb
+
+    @property
+    def free_percent(self):
+        """ Free space / capacity of every partition, in percent """
+        return percent(self.free_mb, self.capacity_mb)
+
+
+def _free_percents(sheet):
+    """
+    Generator - return the free space in percent of every partition, from
+    the 'Free % ' column or from the sizes when that cell is empty (None
+    when the capacity is unknown), as VPartition.free_percent
+    """
+    if 'Free % ' in sheet.columns:
+        percents = sheet.column('Free % ')
+    else:
+        percents = [''] * sheet.nrows
+    for value, capacity, free in zip(percents,
+                                     sheet.typed_column('Capacity MB'),
+                                     sheet.typed_column('Free MB')):
+        if value != '':
+            yield float(value)
+        else:
+            yield percent(free, capacity)
+
+
+def guest_capacity(inventory: Inventory, by='vm', threshold=None):
+    """
+    Compute the capacity figures of the guest filesystems in one pass over
+    tabvPartition, grouped by VM, host, cluster or datacenter
+    :param inventory: the Inventory of the RVTools file
+    :param by: 'vm', 'host', 'cluster' or 'datacenter'
+    :param threshold: a partition with less free space (in percent) than
+                      that is counted in low_partitions
+    :return dict: a dictionary with GROUP_NAME:GuestCapacity
+    """
+    if by not in GROUPS:
+        raise PyRvtoolsError('Unknown grouping: %s' % by)
+
+    vm_groups = None
+    if GROUPS[by] is not None:
+        vms = inventory.sheet('tabvInfo')
+        vm_groups = dict(zip(vms.column('VM'), vms.column(GROUPS[by])))
+
+    totals = {}
+    partitions = inventory.sheet('tabvPartition')
+    for vm, capacity, free, free_percent in zip(
+            partitions.column('VM'), partitions.column('Capacity MB'),
+            partitions.column('Free MB'), _free_percents(partitions)):
+        group = vm if vm_groups is None else vm_groups.get(vm, '')
+        values = totals.get(group)
+        if values is None:
+            values = totals[group] = [0, 0, 0, 0, None]
+        values[PARTITIONS] += 1
+        values[CAPACITY] += number(capacity)
+        values[FREE] += number(free)
+        if free_percent is None:
+            continue
+        if threshold is not None and free_percent < threshold:
+            values[LOW] += 1
+        if values[MIN_FREE] is None or free_percent < values[MIN_FREE]:
+            values[MIN_FREE] = free_percent
+
+    return {group: GuestCapacity(*values) for group, values in totals.items()}
+
+
+def worst_partitions(inventory: Inventory, limit=100, threshold=None):
+    """
+    Return the partitions with the least free space (in percent), the
+    worst first. Only the best candidates are kept while reading the
+    column (no sort of the whole sheet)
+    :param inventory: the Inventory of the RVTools file
+    :param limit: maximum number of partitions
+    :param threshold: only keep the partitions with less free space (in
+                      percent) than that
+    :return list: a list of VPartition objects
+    """
+    sheet = inventory.sheet('tabvPartition')
+    candidates = ((free_percent, row)
+                  for row, free_percent in enumerate(_free_percents(sheet))
+                  if free_percent is not None and
+                  (threshold is None or free_percent < threshold))
+    worst = heapq.nsmallest(limit, candidates, key=itemgetter(0))
+    return [VPartition(inventory, row) for _, row in worst]
@@ -2,19 +2,40 @@
 # coding : utf-8
 
 import os
+from pyrvtools.aggregate import aggregate
+from pyrvtools.cache import InventoryCache
 from pyrvtools.esx_types import Cluster, DataCenter, DataStore, Host, VirtualMachine
-from pyrvtools.errors import PyRvtoolsError, ObjectNotFoundError, FileNonConformantError
-from xlrd import open_workbook
+from pyrvtools.errors import PyRvtoolsError, ObjectNotFoundError
+from pyrvtools.export import export
+from pyrvtools.fleet import Fleet
+from pyrvtools.inventory import Inventory
+from pyrvtools.network import NetworkIndex
+from pyrvtools.partitions import guest_capacity, worst_partitions
+from pyrvtools.query import Query
+from pyrvtools.readers import open_reader
+from pyrvtools.search import KINDS, NameIndex
+from pyrvtools.stats import Stats
+from pyrvtools.storage import storage_usage
 from xlrd.sheet import Sheet
 
 
 class PyRvtools(object):
     """ Extract useful information from an RVTools file """
 
-    def __init__(self, filename: str):
+    def __init__(self, filename: str, reader=None, cache_dir=None,
+                 memory_budget=None, keep_indexes=False, validate=True):
         """
         Constructor
         :param filename: RVTools inventory file
+        :param reader: Reader class or instance (default: chosen by extension)
+        :param cache_dir: directory of the parsed inventory cache (optional)
+        :param memory_budget: approximate size in bytes of the sheets kept
+                              in memory, the least recently used ones are
+                              unloaded above it (default: no limit)
+        :param keep_indexes: (boolean) keep the hash indexes of the
+                             unloaded sheets
+        :param validate: (boolean) check the tabs and columns of the file
+                         (raise FileNonConformantError)
         """
 
         if not os.path.isfile(filename):
@@ -23,8 +44,91 @@ class PyRvtools(object):
         if not os.access(filename, os.R_OK):
             raise PyRvtoolsError('Can\'t read file: %s' % filename)
 
-        self._book = open_workbook(filename, on_demand=True)
-        # self._health_check() # Slow with this method, full sheet load ?
+        cache = InventoryCache(cache_dir, filename) if cache_dir else None
+        self._reader = cache.load() if cache else None
+        cached = self._reader is not None
+        if not cached:
+            self._reader = open_reader(filename, reader)
+        self._inventory = Inventory(self._reader, memory_budget, keep_indexes)
+        # a non conformant file is never cached
+        if validate:
+            self._health_check()
+        if cache and not cached:
+            cache.store(self._inventory)
+        self._names = None
+        self._network = None
+
+    @property
+    def filename(self):
+        return self._reader.filename
+
+    @property
+    def inventory(self):
+        return self._inventory
+
+    @property
+    def names(self):
+        """
+        Search of the VMs, hosts, clusters and datastores by prefix, glob,
+        regex or fuzzy name (see NameIndex), built on first use
+        """
+        if self._names is None:
+            self._names = NameIndex(self._inventory)
+        return self._names
+
+    @property
+    def network(self):
+        """
+        Reverse index of the network adapters by IP, MAC address, subnet,
+        network and switch (see NetworkIndex), built on first use
+        """
+        if self._network is None:
+            self._network = NetworkIndex(self._inventory)
+        return self._network
+
+    @property
+    def stats(self):
+        """ Stats of the work done since enable_stats (None: disabled) """
+        return self._inventory.stats
+
+    @property
+    def vcenter(self):
+        return self._inventory.vcenter
+
+    @property
+    def clusters(self):
+        """ Query over the Cluster objects (see Query.where) """
+        return Query(self._inventory, Cluster)
+
+    @property
+    def datacenters(self):
+        """ Query over the DataCenter objects (see Query.where) """
+        return Query(self._inventory, DataCenter)
+
+    @property
+    def datastores(self):
+        """ Query over the DataStore objects (see Query.where) """
+        return Query(self._inventory, DataStore)
+
+    @property
+    def hosts(self):
+        """ Query over the Host objects (see Query.where) """
+        return Query(self._inventory, Host)
+
+    @property
+    def vms(self):
+        """ Query over the VirtualMachine objects (see Query.where) """
+        return Query(self._inventory, VirtualMachine)
+
+    @staticmethod
+    def load_many(filenames, workers=None):
+        """
+        Parse several RVTools files in parallel (one process per file)
+        :param filenames: an iterable of RVTools inventory files
+        :param workers: number of processes (default: number of CPUs)
+        :return Fleet: a merged view of these files
+        """
+        return Fleet.load(filenames, workers=workers)
 
     @staticmethod
     def get_columns_names(sheet: Sheet):
@@ -44,26 +148,134 @@ class PyRvtools(object):
         :param sheet_name: Name of the sheet to parse
         :param value_name: Value you are looking for
         """
-        sheet = self._book.sheet_by_name(sheet_name)
-        mapping = self.get_columns_names(sheet)
-        for idx in range(sheet.nrows):
-            if idx == 0:
-                continue
-            yield sheet.cell_value(idx, mapping[value_name])
+        index = self._inventory.sheet(sheet_name)
+        yield from index.column_values(value_name)
+
+    def _get_by_names(self, cls, names, strict=False):
+        """
+        Search several objects of a class through the index of the sheet
+        :param cls: class of the ESX objects (Host, VirtualMachine, ...)
+        :param names: an iterable of names
+        :param strict: (boolean) raise an error if some names are missing
+        :return dict: a dictionary with NAME:OBJECT (None if not found)
+        """
+        sheet = self._inventory.sheet(cls.SHEET)
+        found = {}
+        for name in names:
+            if name and sheet.find(cls.KEY, name):
+                found[name] = self._inventory.get(cls, name)
+            else:
+                found[name] = None
+
+        missing = [str(name) for name, one in found.items() if one is None]
+        if strict and missing:
+            raise ObjectNotFoundError('%s not found: %s' %
+                                      (cls.__name__, ', '.join(missing)))
+        return found
 
     def _health_check(self):
-        """ Do some health check before go ahead """
+        """
+        Do some health check before go ahead: the tabs and the header rows
+        only, the sheets are not parsed
+        """
+        self._inventory.validate()
 
-        all_tabs = []
-        needed_tabs = ['tabvInfo', 'tabvDisk', 'tabvPartition',
-                       'tabvHost', 'tabvHBA', 'tabvDatastore']
+    def aggregate(self, by='cluster'):
+        """
+        Capacity figures (vCPU per core, memory overcommit, storage...)
+        computed over whole columns and grouped by datacenter, cluster,
+        host or datastore
+        :param by: 'datacenter', 'cluster', 'host' or 'datastore'
+        :return dict: a dictionary with GROUP_NAME:Capacity
+        """
+        return aggregate(self._inventory, by=by)
 
-        for sheet in self._book.sheets():
-            all_tabs.append(sheet.name)
+    def enable_stats(self, hooks=()):
+        """
+        Count and time the sheet loads, column scans, cells read, index
+        searches, objects created and properties read (see Stats)
+        :param hooks: an iterable of callables (metric, key, amount) called
+                      on every event
+        :return Stats: the counters, see Stats.snapshot
+        """
+        self._inventory.stats = Stats(hooks)
+        return self._inventory.stats
+
+    def disable_stats(self):
+        """ Stop the counting started by enable_stats """
+        self._inventory.stats = None
+
+    def reload(self, filename: str, reader=None):
+        """
+        Switch to a new export of the same vCenter. Only the changed sheets
+        and rows are read again, the Host, VirtualMachine... objects
+        already returned stay valid and give the new values
+        :param filename: the new RVTools inventory file
+        :param reader: Reader class or instance (default: chosen by extension)
+        :return dict: a dictionary with SHEET_NAME:CHANGED_ROWS (offsets of
+                      the changed rows, None when rows were added or
+                      removed)
+        """
+        if not os.path.isfile(filename):
+            raise PyRvtoolsError('Incorrect filename: %s' % filename)
 
-        if not set(needed_tabs).issubset(set(all_tabs)):
-            msg = 'The file is not a RVTools file'
-            raise FileNonConformantError(msg)
+        if not os.access(filename, os.R_OK):
+            raise PyRvtoolsError('Can\'t read file: %s' % filename)
+
+        reader = open_reader(filename, reader)
+        changes = self._inventory.reload(reader)
+        self._reader = reader
+        if set(changes) & {cls.SHEET for cls in KINDS}:
+            self._names = None
+        if 'tabvNetwork' in changes:
+            self._network = None
+        return changes
+
+    def export(self, directory: str, fmt='csv', sheets=None,
+               batch_size=10000):
+        """
+        Write the sheets in CSV, Parquet or Arrow IPC files (one per sheet),
+        with the same types as the properties of the ESX objects
+        :param directory: destination directory
+        :param fmt: 'csv', 'parquet' or 'arrow' (the last two need pyarrow)
+        :param sheets: names of the sheets to export (default: all of them)
+        :param batch_size: number of rows converted at a time
+        :return list: the paths of the written files
+        """
+        return export(self._inventory, directory, fmt=fmt, sheets=sheets,
+                      batch_size=batch_size)
+
+    def storage_usage(self):
+        """
+        Storage figures of every datastore (provisioned vs capacity, thin
+        and thick disks, eager zeroed disks, VMs, projected fill ratio)
+        computed in one pass over tabvDisk and tabvDatastore
+        :return dict: a dictionary with DATASTORE_NAME:DatastoreUsage
+        """
+        return storage_usage(self._inventory)
+
+    def guest_capacity(self, by='vm', threshold=None):
+        """
+        Capacity figures of the guest filesystems (tabvPartition) computed
+        in one pass and grouped by VM, host, cluster or datacenter
+        :param by: 'vm', 'host', 'cluster' or 'datacenter'
+        :param threshold: count the partitions with less free space (in
+                          percent) than that in low_partitions
+        :return dict: a dictionary with GROUP_NAME:GuestCapacity
+        """
+        return guest_capacity(self._inventory, by=by, threshold=threshold)
+
+    def worst_partitions(self, limit=100, threshold=None):
+        """
+        Return the guest partitions with the least free space (in
+        percent), the worst first
+        :param limit: maximum number of partitions
+        :param threshold: only keep the partitions with less free space (in
+                          percent) than that
+        :return list: a list of VPartition objects
+        """
+        return worst_partitions(self._inventory, limit=limit,
+                                threshold=threshold)
 
     def get_clusters(self):
         """
@@ -73,7 +285,17 @@ class PyRvtools(object):
 
         for cluster in set(self._get_names('tabvHost', 'Cluster')):
             if cluster:
-                yield Cluster(self._book, cluster)
+                yield self._inventory.get(Cluster, cluster)
+
+    def get_clusters_by_names(self, names, strict=False):
+        """
+        Search several Cluster objects in one pass
+        :param names: an iterable of names
+        :param strict: (boolean) raise one ObjectNotFoundError listing every
+                       missing name
+        :return dict: a dictionary with NAME:Cluster (None if not found)
+        """
+        return self._get_by_names(Cluster, names, strict=strict)
 
     def get_clusters_by_name(self, name):
         """
@@ -81,11 +303,7 @@ class PyRvtools(object):
         :param name: Name of that Cluster
         """
 
-        found = None
-        for cluster in self._get_names('tabvHost', 'Cluster'):
-            if cluster == name:
-                found = Cluster(self._book, cluster)
-                break
+        found = self._get_by_names(Cluster, [name])[name]
 
         if not found:
             raise ObjectNotFoundError('Cluster %s not found' % name)
@@ -100,7 +318,17 @@ class PyRvtools(object):
 
         for datacenter in set(self._get_names('tabvHost', 'Datacenter')):
             if datacenter:
-                yield DataCenter(self._book, datacenter)
+                yield self._inventory.get(DataCenter, datacenter)
+
+    def get_datacenters_by_names(self, names, strict=False):
+        """
+        Search several DataCenter objects in one pass
+        :param names: an iterable of names
+        :param strict: (boolean) raise one ObjectNotFoundError listing every
+                       missing name
+        :return dict: a dictionary with NAME:DataCenter (None if not found)
+        """
+        return self._get_by_names(DataCenter, names, strict=strict)
 
     def get_datacenter_by_name(self, name):
         """
@@ -108,11 +336,7 @@ class PyRvtools(object):
         :param name: Name of that DataCenter
         """
 
-        found = None
-        for datacenter in self._get_names('tabvHost', 'Datacenter'):
-            if datacenter == name:
-                found = DataCenter(self._book, datacenter)
-                break
+        found = self._get_by_names(DataCenter, [name])[name]
 
         if not found:
             raise ObjectNotFoundError('Datacenter %s not found' % name)
@@ -126,7 +350,17 @@ class PyRvtools(object):
         """
 
         for datastore in self._get_names('tabvDatastore', 'Name'):
-            yield DataStore(self._book, datastore)
+            yield self._inventory.get(DataStore, datastore)
+
+    def get_datastores_by_names(self, names, strict=False):
+        """
+        Search several DataStore objects in one pass
+        :param names: an iterable of names
+        :param strict: (boolean) raise one ObjectNotFoundError listing every
+                       missing name
+        :return dict: a dictionary with NAME:DataStore (None if not found)
+        """
+        return self._get_by_names(DataStore, names, strict=strict)
 
     def get_datastore_by_name(self, name):
         """
@@ -134,11 +368,7 @@ class PyRvtools(object):
         :param name: Name of that DataStore
         """
 
-        found = None
-        for datastore in self._get_names('tabvDatastore', 'Name'):
-            if datastore == name:
-                found = DataStore(self._book, datastore)
-                break
+        found = self._get_by_names(DataStore, [name])[name]
 
         if not found:
             raise ObjectNotFoundError('Datastore %s not found' % name)
@@ -151,7 +381,17 @@ class PyRvtools(object):
         """
 
         for host in self._get_names('tabvHost', 'Host'):
-            yield Host(self._book, host)
+            yield self._inventory.get(Host, host)
+
+    def get_hosts_by_names(self, names, strict=False):
+        """
+        Search several Host objects in one pass
+        :param names: an iterable of names
+        :param strict: (boolean) raise one ObjectNotFoundError listing every
+                       missing name
+        :return dict: a dictionary with NAME:Host (None if not found)
+        """
+        return self._get_by_names(Host, names, strict=strict)
 
     def get_host_by_name(self, name):
         """
@@ -159,11 +399,7 @@ class PyRvtools(object):
         :param name: Name of that Host
         """
 
-        found = None
-        for host in self._get_names('tabvHost', 'Host'):
-            if host == name:
-                found = Host(self._book, host)
-                break
+        found = self._get_by_names(Host, [name])[name]
 
         if not found:
             raise ObjectNotFoundError('Host %s not found' % name)
@@ -176,7 +412,17 @@ class PyRvtools(object):
         """
 
         for vm in self._get_names('tabvInfo', 'VM'):
-            yield VirtualMachine(self._book, vm)
+            yield self._inventory.get(VirtualMachine, vm)
+
+    def get_vms_by_names(self, names, strict=False):
+        """
+        Search several VirtualMachine objects in one pass
+        :param names: an iterable of names
+        :param strict: (boolean) raise one ObjectNotFoundError listing every
+                       missing name
+        :return dict: a dictionary with NAME:VirtualMachine (None if not found)
+        """
+        return self._get_by_names(VirtualMachine, names, strict=strict)
 
     def get_vm_by_name(self, name):
         """
@@ -184,11 +430,7 @@ class PyRvtools(object):
         :param name: Name of that VirtualMachine
         """
 
-        found = None
-        for vm in self._get_names('tabvInfo', 'VM'):
-            if vm == name:
-                found = VirtualMachine(self._book, vm)
-                break
+        found = self._get_by_names(VirtualMachine, [name])[name]
 
         if not found:
             raise ObjectNotFoundError('VirtualMachine %s not found' % name)
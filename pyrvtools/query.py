@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# coding : utf-8
+
+import operator
+from pyrvtools.errors import PyRvtoolsError
+from pyrvtools.inventory import Inventory
+from pyrvtools.schema import TYPES
+
+
+def _contains(value, target):
+    # substring of a text, or item of a list (ex: the hosts of a datastore)
+    return isinstance(value, (str, list)) and target in value
+
+
+def _icontains(value, target):
+    if isinstance(value, list):
+        return target.lower() in (one.lower() for one in value)
+    return isinstance(value, str) and target.lower() in value.lower()
+
+
+def _startswith(value, target):
+    return isinstance(value, str) and value.startswith(target)
+
+
+def _endswith(value, target):
+    return isinstance(value, str) and value.endswith(target)
+
+
+def _in(value, target):
+    return value in target
+
+
+OPERATORS = {
+    'eq': operator.eq,
+    'ne': operator.ne,
+    'gt': operator.gt,
+    'ge': operator.ge,
+    'lt': operator.lt,
+    'le': operator.le,
+    'in': _in,
+    'contains': _contains,
+    'icontains': _icontains,
+    'startswith': _startswith,
+    'endswith': _endswith,
+}
+
+
+class Query(object):
+    """ Lazy filter of ESX objects, evaluated on the columns of a sheet """
+
+    def __init__(self, inventory: Inventory, cls, predicates=()):
+        """
+        Constructor
+        :param inventory: the shared Inventory of the RVTools file
+        :param cls: class of the ESX objects (Host, VirtualMachine, ...)
+        :param predicates: list of (PROPERTY, OPERATOR, VALUE)
+        """
+        self._inventory = inventory
+        self._cls = cls
+        self._predicates = tuple(predicates)
+
+    def __iter__(self):
+        return self.objects()
+
+    def __len__(self):
+        return len(self.names())
+
+    def __repr__(self):
+        return 'Query(%s, %s)' % (self._cls.__name__, self._predicates)
+
+    def _parse(self, expression: str, value):
+        """
+        Return the (PROPERTY, OPERATOR, VALUE) of a predicate
+        :param expression: property name with an optional operator
+                           (ex: cpu__gt)
+        :param value: value to compare to
+        """
+        field, _, name = expression.partition('__')
+        if field not in self._cls.FIELDS:
+            raise PyRvtoolsError('Unknown field for %s: %s' %
+                                 (self._cls.__name__, field))
+        if (name or 'eq') not in OPERATORS:
+            raise PyRvtoolsError('Unknown operator: %s' % name)
+        return field, name or 'eq', value
+
+    def where(self, **predicates):
+        """
+        Return a new Query with more predicates (all of them must match)
+        ex: where(cpu__gt=8, power_state='poweredOn')
+        """
+        parsed = [self._parse(expression, value)
+                  for expression, value in predicates.items()]
+        return Query(self._inventory, self._cls,
+                     self._predicates + tuple(parsed))
+
+    def _indexed(self, field: str, name: str, value):
+        """
+        Tell if a predicate can be resolved through the hash index of its
+        column: an equality on a column read as it is (see schema.TYPES)
+        with a hashable value
+        """
+        if name != 'eq' or field in self._cls.CONVERSIONS:
+            return False
+        if self._cls.FIELDS[field] in TYPES:
+            return False
+        try:
+            hash(value)
+        except TypeError:
+            return False
+        return True
+
+    def _values(self, sheet, field: str):
+        """ Return the value of a property for every row of the sheet """
+        values = sheet.typed_column(self._cls.FIELDS[field])
+        convert = self._cls.CONVERSIONS.get(field)
+        if convert is not None:
+            values = [convert(value) if value is not None else None
+                      for value in values]
+        return values
+
+    def rows(self):
+        """
+        Return the offsets of the matching rows. The predicates are
+        evaluated on the same values as the properties (empty cells never
+        match), an equality on a raw column is resolved first through the
+        hash index of the sheet
+        :return list: a list of row offsets
+        """
+        sheet = self._inventory.sheet(self._cls.SHEET)
+        predicates = sorted(self._predicates,
+                            key=lambda p: not self._indexed(*p))
+
+        rows = None
+        for field, name, value in predicates:
+            if rows is None and self._indexed(field, name, value):
+                rows = list(sheet.find(self._cls.FIELDS[field], value))
+                continue
+
+            values = self._values(sheet, field)
+            compare = OPERATORS[name]
+            if rows is None:
+                rows = [row for row, one_value in enumerate(values)
+                        if one_value is not None and
+                        compare(one_value, value)]
+            else:
+                rows = [row for row in rows
+                        if values[row] is not None and
+                        compare(values[row], value)]
+
+        if rows is None:
+            rows = range(sheet.nrows)
+        return rows
+
+    def names(self):
+        """
+        Return the names of the matching objects (without duplicates)
+        :return list: a list of names
+        """
+        names = self._inventory.sheet(self._cls.SHEET).column(self._cls.KEY)
+        found = {}
+        for row in self.rows():
+            if names[row]:
+                found[names[row]] = None
+        return list(found)
+
+    def objects(self):
+        """
+        Generator - return the matching ESX objects
+        """
+        for name in self.names():
+            yield self._inventory.get(self._cls, name)
+
+    def count(self):
+        return len(self)
+
+    def first(self):
+        """ Return the first matching object, None if nothing matches """
+        return next(self.objects(), None)
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+# coding : utf-8
+
+import os
+import re
+import zipfile
+from pyrvtools.errors import FileNonConformantError
+from pyrvtools.index import make_column
+from xml.etree.ElementTree import iterparse
+from xlrd import open_workbook
+from xlrd.biffh import XL_CELL_DATE, XL_CELL_NUMBER
+
+NUMERIC_TYPES = (XL_CELL_NUMBER, XL_CELL_DATE)
+
+NS_MAIN = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+NS_REL = ('{http://schemas.openxmlformats.org/officeDocument/2006/'
+          'relationships}')
+NS_PKG_REL = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+
+class Reader(object):
+    """ Super class of every workbook reader """
+
+    def __init__(self, filename: str):
+        """
+        Constructor
+        :param filename: RVTools inventory file
+        """
+        self._filename = filename
+
+    @property
+    def filename(self):
+        return self._filename
+
+    def read_sheet(self, name: str, columns=None):
+        """
+        Read the columns of a sheet
+        :param name: Name of the sheet
+        :param columns: Names of the columns to keep (None: all of them)
+        :return dict: a dictionary with COLUMN_NAME:COLUMN_VALUES
+        """
+        raise NotImplementedError
+
+    def read_header(self, name: str):
+        """
+        Return the names of the columns of a sheet, if the reader can read
+        them without parsing the whole sheet
+        :param name: Name of the sheet
+        :return list: a list of names (None: not available)
+        """
+        return None
+
+    def fingerprint(self, name: str):
+        """
+        Return a cheap fingerprint of a sheet, if the reader has one (two
+        versions of a sheet with the same fingerprint are identical)
+        :param name: Name of the sheet
+        :return: a hashable value (None: not available)
+        """
+        return None
+
+    def read_indexes(self, name: str):
+        """
+        Return the prebuilt indexes of a sheet, if the reader has some
+        :param name: Name of the sheet
+        :return dict: a dictionary with COLUMN_NAME:INDEX
+        """
+        return {}
+
+    def sheet_names(self):
+        """ Return the names of the sheets of the workbook """
+        raise NotImplementedError
+
+
+class XlsReader(Reader):
+    """ Reader of the legacy .xls format (through xlrd) """
+
+    def __init__(self, filename: str):
+        """
+        Constructor
+        :param filename: RVTools inventory file
+        """
+        super().__init__(filename)
+        self._book = open_workbook(filename, on_demand=True)
+
+    def read_sheet(self, name: str, columns=None):
+        sheet = self._book.sheet_by_name(name)
+        data = {}
+        if sheet.nrows:
+            for col_index, col_name in enumerate(sheet.row_values(0)):
+                if columns is not None and col_name not in columns:
+                    continue
+                types = sheet.col_types(col_index, 1)
+                numeric = all(cell in NUMERIC_TYPES for cell in types)
+                data[col_name] = make_column(sheet.col_values(col_index, 1),
+                                             numeric)
+        self._book.unload_sheet(name)
+        return data
+
+    def sheet_names(self):
+        return self._book.sheet_names()
+
+
+class XlsxReader(Reader):
+    """ Streaming reader of the .xlsx format (modern RVTools output) """
+
+    def __init__(self, filename: str):
+        """
+        Constructor
+        :param filename: RVTools inventory file
+        """
+        super().__init__(filename)
+        try:
+            self._zip = zipfile.ZipFile(filename)
+        except zipfile.BadZipFile:
+            raise FileNonConformantError('Not a xlsx file: %s' % filename)
+        self._sheets = self._read_sheet_paths()
+        self._strings = None
+
+    def _read_sheet_paths(self):
+        """
+        Return a dictionary with SHEET_NAME:PATH_IN_ARCHIVE
+        """
+        targets = {}
+        with self._zip.open('xl/_rels/workbook.xml.rels') as rels:
+            for _, elem in iterparse(rels):
+                if elem.tag == NS_PKG_REL + 'Relationship':
+                    target = elem.get('Target')
+                    if target.startswith('/'):
+                        target = target[1:]
+                    elif not target.startswith('xl/'):
+                        target = 'xl/' + target
+                    targets[elem.get('Id')] = target
+
+        paths = {}
+        with self._zip.open('xl/workbook.xml') as workbook:
+            for _, elem in iterparse(workbook):
+                if elem.tag == NS_MAIN + 'sheet':
+                    paths[elem.get('name')] = targets[elem.get(NS_REL + 'id')]
+        return paths
+
+    def _shared_strings(self):
+        """ Return (and load once) the table of shared strings """
+        if self._strings is None:
+            self._strings = []
+            if 'xl/sharedStrings.xml' in self._zip.namelist():
+                with self._zip.open('xl/sharedStrings.xml') as strings:
+                    for _, elem in iterparse(strings):
+                        if elem.tag == NS_MAIN + 'si':
+                            self._strings.append(''.join(
+                                elem.itertext()))
+                            elem.clear()
+        return self._strings
+
+    @staticmethod
+    def _column_number(reference: str):
+        """
+        Return the 0-based column number of a cell reference (ex: AB12)
+        :param reference: the cell reference
+        """
+        number = 0
+        for char in re.match(r'[A-Z]+', reference).group():
+            number = number * 26 + ord(char) - 64
+        return number - 1
+
+    def _cell_value(self, cell):
+        """
+        Decode the value of a cell element
+        :param cell: a <c> element
+        :return: the value as xlrd would return it and a numeric flag
+        """
+        cell_type = cell.get('t', 'n')
+        if cell_type == 'inlineStr':
+            return ''.join(cell.find(NS_MAIN + 'is').itertext()), False
+
+        raw = cell.findtext(NS_MAIN + 'v')
+        if raw is None:
+            return '', False
+        if cell_type == 's':
+            return self._shared_strings()[int(raw)], False
+        if cell_type == 'b':
+            return int(raw), False
+        if cell_type in ('str', 'e'):
+            return raw, False
+        return float(raw), True
+
+    def _rows(self, path: str):
+        """
+        Generator - Return the rows of a sheet, one list of cells per row
+        :param path: path of the sheet in the archive
+        """
+        expected = 1
+        with self._zip.open(path) as sheet:
+            sheet_data = None
+            for event, elem in iterparse(sheet, events=('start', 'end')):
+                if event == 'start':
+                    if elem.tag == NS_MAIN + 'sheetData':
+                        sheet_data = elem
+                    continue
+
+                if elem.tag != NS_MAIN + 'row':
+                    continue
+
+                number = int(elem.get('r', expected))
+                while expected < number:
+                    yield []
+                    expected += 1
+                expected += 1
+
+                cells = []
+                for cell in elem.iter(NS_MAIN + 'c'):
+                    reference = cell.get('r')
+                    if reference:
+                        col_number = self._column_number(reference)
+                    else:
+                        col_number = len(cells)
+                    cells.append((col_number, self._cell_value(cell)))
+                yield cells
+                sheet_data.clear()
+
+    def _path(self, name: str):
+        """ Return the path of a sheet in the archive """
+        try:
+            return self._sheets[name]
+        except KeyError:
+            raise FileNonConformantError('No sheet named %s' % name)
+
+    def fingerprint(self, name: str):
+        info = self._zip.getinfo(self._path(name))
+        return info.CRC, info.file_size
+
+    def read_header(self, name: str):
+        rows = self._rows(self._path(name))
+        try:
+            return [value for _, (value, _) in next(rows, [])]
+        finally:
+            rows.close()
+
+    def read_sheet(self, name: str, columns=None):
+        rows = self._rows(self._path(name))
+        header = {}
+        for col_number, (value, _) in next(rows, []):
+            if columns is None or value in columns:
+                header[col_number] = value
+
+        values = {col_number: [] for col_number in header}
+        numeric = {col_number: True for col_number in header}
+        for row in rows:
+            cells = dict(row)
+            for col_number, column in values.items():
+                value, is_number = cells.get(col_number, ('', False))
+                column.append(value)
+                numeric[col_number] = numeric[col_number] and is_number
+
+        data = {}
+        for col_number, col_name in header.items():
+            data[col_name] = make_column(values[col_number],
+                                         numeric[col_number])
+        return data
+
+    def sheet_names(self):
+        return list(self._sheets)
+
+
+class MemoryReader(Reader):
+    """ Reader of sheets already parsed (ex: in another process) """
+
+    def __init__(self, filename: str, sheets: dict, sheet_names=None):
+        """
+        Constructor
+        :param filename: RVTools inventory file
+        :param sheets: a dictionary with SHEET_NAME:{COLUMN_NAME:VALUES}
+        :param sheet_names: names of every sheet of the workbook
+        """
+        super().__init__(filename)
+        self._sheets = sheets
+        self._sheet_names = list(sheet_names or sheets)
+
+    def read_header(self, name: str):
+        return list(self._sheets[name])
+
+    def read_sheet(self, name: str, columns=None):
+        return {col_name: values
+                for col_name, values in self._sheets[name].items()
+                if columns is None or col_name in columns}
+
+    def sheet_names(self):
+        return self._sheet_names
+
+
+READERS = {
+    '.xls': XlsReader,
+    '.xlsx': XlsxReader,
+    '.xlsm': XlsxReader,
+}
+
+
+def open_reader(filename: str, reader=None):
+    """
+    Return the reader matching the format of an RVTools file
+    :param filename: RVTools inventory file
+    :param reader: Reader class (or instance) to use instead of the
+                   extension lookup
+    """
+    if isinstance(reader, Reader):
+        return reader
+    if reader is None:
+        extension = os.path.splitext(filename)[1].lower()
+        reader = READERS.get(extension, XlsReader)
+    return reader(filename)
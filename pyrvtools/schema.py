@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# coding : utf-8
+
+from datetime import datetime, timedelta
+
+# Columns of each RVTools tab used by the ESX objects, readers only keep
+# these ones in memory
+
+SHEETS = {
+    'tabvInfo': ('VM', 'Powerstate', 'CPUs', 'Memory', 'Provisioned MB',
+                 'In Use MB', 'Unshared MB', 'PowerOn', 'Path', 'OS',
+                 'Host', 'Cluster', 'Datacenter', 'VI SDK Server'),
+    'tabvHost': ('Host', 'Datacenter', 'Cluster', 'Boot time', 'CPU usage %',
+                 'ESX Version', '# Memory', 'Memory usage %', 'Model',
+                 '# Cores', '# CPU', '# vCPUs', '# VMs', 'VI SDK Server'),
+    'tabvHBA': ('Host', 'Device', 'Type', 'Status', 'Driver', 'Model',
+                'WWN'),
+    'tabvDisk': ('VM', 'Disk', 'Capacity MB', 'Thin', 'Eagerly Scrub',
+                 'Path'),
+    'tabvNetwork': ('VM', 'Powerstate', 'Adapter', 'Network', 'Switch',
+                    'Connected', 'Mac Address', 'IP Address'),
+    'tabvPartition': ('VM', 'Disk', 'Capacity MB', 'Free MB', 'Free % '),
+    'tabvDatastore': ('Name', 'Address', 'Type', '# VMs', 'Capacity MB',
+                      'Provisioned MB', 'In Use MB', 'Free MB', 'Free %',
+                      'SIOC enabled', '# Hosts', 'Hosts', 'Major Version'),
+}
+
+# Other spellings of some columns across RVTools versions, renamed to the
+# name of SHEETS on load (tabvPartition has a trailing space in 'Free % ')
+ALIASES = {
+    'tabvPartition': {'Free %': 'Free % '},
+}
+
+
+def sheet_columns(name: str):
+    """
+    Return the columns to read from a tab: the ones of SHEETS and their
+    other spellings (None: every column)
+    :param name: Name of the tab
+    """
+    columns = SHEETS.get(name)
+    if columns is not None and name in ALIASES:
+        columns = columns + tuple(ALIASES[name])
+    return columns
+
+
+def rename_columns(name: str, columns: dict):
+    """
+    Rename the other spellings of the columns of a tab to their name in
+    SHEETS (in place)
+    :param name: Name of the tab
+    :param columns: a dictionary with COLUMN_NAME:VALUES
+    :return dict: the same dictionary
+    """
+    for alias, column in ALIASES.get(name, {}).items():
+        if alias in columns and column not in columns:
+            columns[column] = columns.pop(alias)
+    return columns
+
+
+# Key columns of each tab, the ones used to search rows
+
+KEYS = {
+    'tabvInfo': ('VM', 'Host'),
+    'tabvHost': ('Host', 'Cluster', 'Datacenter'),
+    'tabvHBA': ('Host',),
+    'tabvDisk': ('VM',),
+    'tabvNetwork': ('VM',),
+    'tabvPartition': ('VM',),
+    'tabvDatastore': ('Name',),
+}
+
+# Type of the columns, the same conversions as the ESX object properties
+# (the other columns are kept as they are read)
+
+DATE_FORMAT = '%d/%m/%Y %H:%M:%S'
+
+# Day 0 of the Excel serial dates (1900 date system)
+EXCEL_EPOCH = datetime(1899, 12, 30)
+
+TYPES = {
+    '# CPU': 'int',
+    '# Cores': 'int',
+    '# Hosts': 'int',
+    '# Memory': 'int',
+    '# VMs': 'int',
+    '# vCPUs': 'int',
+    'Boot time': 'datetime',
+    'CPU usage %': 'int',
+    'CPUs': 'int',
+    'Capacity MB': 'int',
+    'Connected': 'bool',
+    'Eagerly Scrub': 'bool',
+    'Free %': 'int',
+    'Free % ': 'int',
+    'Free MB': 'int',
+    'Hosts': 'list',
+    'IP Address': 'list',
+    'In Use MB': 'int',
+    'Memory': 'int',
+    'Memory usage %': 'int',
+    'PowerOn': 'datetime',
+    'Provisioned MB': 'int',
+    'SIOC enabled': 'bool',
+    'Thin': 'bool',
+    'Unshared MB': 'int',
+}
+
+
+def _to_datetime(value):
+    if not value:
+        return None
+    if isinstance(value, (int, float)):
+        return EXCEL_EPOCH + timedelta(seconds=round(value * 86400))
+    if (len(value) == 19 and value[2] == value[5] == '/' and
+            value[13] == value[16] == ':'):
+        # DATE_FORMAT, sliced (strptime is slow)
+        return datetime(int(value[6:10]), int(value[3:5]), int(value[:2]),
+                        int(value[11:13]), int(value[14:16]),
+                        int(value[17:19]))
+    return datetime.strptime(value, DATE_FORMAT)
+
+
+def _to_float(value):
+    return float(value) if value != '' else None
+
+
+def _to_int(value):
+    return int(value) if value != '' else None
+
+
+def _to_list(value):
+    return value.split(', ') if value and value != 'unknown' else []
+
+
+DECODERS = {
+    'bool': bool,
+    'datetime': _to_datetime,
+    'float': _to_float,
+    'int': _to_int,
+    'list': _to_list,
+}
+
+
+def number(value):
+    """
+    Numeric value of a raw cell, empty cells count as 0 (used to add up
+    whole columns)
+    :param value: raw value of the cell
+    """
+    return float(value) if value != '' else 0.0
+
+
+def ratio(numerator, denominator):
+    """ Return numerator / denominator, None if the denominator is 0 """
+    return numerator / denominator if denominator else None
+
+
+def percent(part, whole):
+    """ Return part / whole in percent, None if the whole is 0 or unknown """
+    return part * 100 / whole if whole and part is not None else None
+
+
+def datastore_name(path: str):
+    """
+    Return the name of the DataStore of a path ([DATASTORE] folder/file)
+    :param path: a vSphere path
+    """
+    return path[path.find('[')+1:path.find(']')]
+
+
+def decode(column: str, value):
+    """
+    Convert a raw cell value to the type of its column
+    :param column: Name of the column
+    :param value: raw value of the cell
+    """
+    kind = TYPES.get(column)
+    return DECODERS[kind](value) if kind else value
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# coding : utf-8
+
+import fnmatch
+import itertools
+import re
+from bisect import bisect_left
+from collections import Counter
+from difflib import SequenceMatcher
+from pyrvtools.esx_types import Cluster, DataStore, Host, VirtualMachine
+from pyrvtools.inventory import Inventory
+
+KINDS = (VirtualMachine, Host, Cluster, DataStore)
+
+
+def _trigrams(text: str):
+    """ Set of the 3-grams of a (lowercase) text, padded on both sides """
+    padded = '  %s ' % text
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex(object):
+    """
+    Search of the objects by name: prefix (through a sorted list of the
+    lowercase names), glob or regex, and fuzzy search ranked through a
+    3-gram index
+    """
+
+    def __init__(self, inventory: Inventory, kinds=KINDS):
+        """
+        Constructor
+        :param inventory: the shared Inventory of the RVTools file
+        :param kinds: classes of the indexed objects
+        """
+        self._inventory = inventory
+        self._entries = []
+        for cls in kinds:
+            names = inventory.sheet(cls.SHEET).column(cls.KEY)
+            for name in dict.fromkeys(names):
+                if name and isinstance(name, str):
+                    self._entries.append((cls, name))
+
+        self._sorted = sorted((name.lower(), entry) for entry, (_, name)
+                              in enumerate(self._entries))
+        self._keys = [key for key, _ in self._sorted]
+
+        self._grams = {}
+        for entry, (_, name) in enumerate(self._entries):
+            for gram in _trigrams(name.lower()):
+                self._grams.setdefault(gram, []).append(entry)
+
+    def _objects(self, entries, kinds=None, limit=None):
+        """ Return the ESX objects of some entries """
+        found = []
+        for entry in entries:
+            cls, name = self._entries[entry]
+            if kinds and cls not in kinds:
+                continue
+            found.append(self._inventory.get(cls, name))
+            if limit and len(found) >= limit:
+                break
+        return found
+
+    def _prefix_entries(self, prefix: str):
+        """ Generator - Return the entries starting with a prefix """
+        prefix = prefix.lower()
+        for position in range(bisect_left(self._keys, prefix),
+                              len(self._keys)):
+            if not self._keys[position].startswith(prefix):
+                break
+            yield self._sorted[position][1]
+
+    def prefix(self, prefix: str, kinds=None, limit=None):
+        """
+        Return the objects whose name starts with a prefix (case
+        insensitive), sorted by name
+        :param prefix: beginning of the name
+        :param kinds: classes of the wanted objects (default: all)
+        :param limit: maximum number of objects
+        :return list: a list of ESX objects
+        """
+        return self._objects(self._prefix_entries(prefix), kinds, limit)
+
+    def glob(self, pattern: str, kinds=None, limit=None):
+        """
+        Return the objects whose name matches a shell pattern (case
+        insensitive, ex: 'web-*-0?')
+        :param pattern: the shell pattern
+        :param kinds: classes of the wanted objects (default: all)
+        :param limit: maximum number of objects
+        :return list: a list of ESX objects
+        """
+        pattern = pattern.lower()
+        literal = re.match(r'[^*?\[]*', pattern).group()
+        regex = re.compile(fnmatch.translate(pattern))
+        entries = (entry for entry in self._prefix_entries(literal)
+                   if regex.match(self._entries[entry][1].lower()))
+        return self._objects(entries, kinds, limit)
+
+    def regex(self, pattern: str, kinds=None, limit=None):
+        """
+        Return the objects whose name matches a regular expression
+        (re.search, case sensitive unless the pattern says otherwise)
+        :param pattern: the regular expression
+        :param kinds: classes of the wanted objects (default: all)
+        :param limit: maximum number of objects
+        :return list: a list of ESX objects
+        """
+        regex = re.compile(pattern)
+        entries = (entry for entry, (_, name) in enumerate(self._entries)
+                   if regex.search(name))
+        return self._objects(entries, kinds, limit)
+
+    def fuzzy(self, text: str, kinds=None, limit=10, candidates=100):
+        """
+        Return the objects whose name looks like a text, best first. The
+        names sharing the most 3-grams with the text are ranked again with
+        difflib
+        :param text: a partial or misspelled name
+        :param kinds: classes of the wanted objects (default: all)
+        :param limit: maximum number of objects
+        :param candidates: number of names ranked again with difflib
+        :return list: a list of (ESX object, score between 0 and 1)
+        """
+        text = text.lower()
+        postings = [self._grams[gram] for gram in _trigrams(text)
+                    if gram in self._grams]
+        # 3-grams shared by a lot of names (ex: a naming prefix) do not
+        # help to rank the names and cost the most, only the rarest one is
+        # kept when there is nothing else
+        common = max(len(self._entries) // 20, candidates)
+        rare = [posting for posting in postings if len(posting) <= common]
+        if not rare and postings:
+            rare = [min(postings, key=len)]
+
+        shared = Counter()
+        for posting in rare:
+            shared.update(posting)
+
+        ranked = (entry for entry, _
+                  in shared.most_common(None if kinds else candidates)
+                  if not kinds or self._entries[entry][0] in kinds)
+        scored = []
+        for entry in itertools.islice(ranked, candidates):
+            name = self._entries[entry][1]
+            score = SequenceMatcher(None, text, name.lower()).ratio()
+            scored.append((score, entry))
+        scored.sort(key=lambda item: -item[0])
+
+        return [(self._inventory.get(*self._entries[entry]), score)
+                for score, entry in scored[:limit]]
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+# coding : utf-8
+
+"""
+Read-only query server: load RVTools files once and answer the lookups,
+filters and aggregations of other processes in JSON, over localhost HTTP
+or a Unix socket
+
+usage: python -m pyrvtools.server FILE [FILE ...] [--port 8765 | --socket PATH]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import re
+import socket
+import socketserver
+import stat
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pyrvtools import errors
+from pyrvtools.esx_types import (Cluster, DataCenter, DataStore, ESXBase,
+                                 Host, RowBase, VirtualMachine)
+from pyrvtools.errors import PyRvtoolsError
+from pyrvtools.pyrvtools import PyRvtools
+from pyrvtools.schema import KEYS
+
+KINDS = {cls.__name__: cls for cls in (Cluster, DataCenter, DataStore, Host,
+                                       VirtualMachine)}
+
+LOOKUPS = {
+    'Cluster': 'get_clusters_by_name',
+    'DataCenter': 'get_datacenter_by_name',
+    'DataStore': 'get_datastore_by_name',
+    'Host': 'get_host_by_name',
+    'VirtualMachine': 'get_vm_by_name',
+}
+
+QUERIES = {
+    'Cluster': 'clusters',
+    'DataCenter': 'datacenters',
+    'DataStore': 'datastores',
+    'Host': 'hosts',
+    'VirtualMachine': 'vms',
+}
+
+# Methods of PyRvtools callable through the server (all read-only)
+METHODS = (
+    'aggregate', 'storage_usage', 'guest_capacity', 'worst_partitions',
+    'get_clusters', 'get_clusters_by_name', 'get_clusters_by_names',
+    'get_datacenters', 'get_datacenter_by_name', 'get_datacenters_by_names',
+    'get_datastores', 'get_datastore_by_name', 'get_datastores_by_names',
+    'get_hosts', 'get_host_by_name', 'get_hosts_by_names',
+    'get_vm', 'get_vm_by_name', 'get_vms_by_names',
+)
+
+# Other calls: properties of one object, filters, name and network search
+EXTRA_METHODS = ('files', 'properties', 'where', 'search', 'network')
+SEARCHES = ('prefix', 'glob', 'regex', 'fuzzy')
+NETWORK_SEARCHES = ('by_ip', 'by_mac', 'in_subnet', 'on_network',
+                    'on_switch')
+
+
+def to_json(value):
+    """
+    Convert a result of PyRvtools to JSON types: an ESX object becomes
+    the dictionary of its fields (the related objects are given by name)
+    :param value: any value returned by PyRvtools
+    """
+    if isinstance(value, ESXBase):
+        fields = {'kind': value.__class__.__name__}
+        for field in value.FIELDS:
+            fields[field] = _scalar(getattr(value, field))
+        return fields
+    if isinstance(value, RowBase):
+        fields = {'kind': value.__class__.__name__}
+        for column, one in value.values().items():
+            fields[column] = _scalar(one)
+        return fields
+    if hasattr(value, '_asdict'):
+        fields = dict(value._asdict())
+        for name in dir(value.__class__):
+            if isinstance(getattr(value.__class__, name), property):
+                fields[name] = getattr(value, name)
+        return fields
+    if isinstance(value, dict):
+        return {str(key): to_json(one) for key, one in value.items()}
+    if isinstance(value, (list, tuple, set)) or hasattr(value, '__next__'):
+        return [to_json(one) for one in value]
+    return _scalar(value)
+
+
+def _scalar(value):
+    if isinstance(value, (ESXBase, RowBase)):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ')
+    if isinstance(value, (list, tuple)):
+        return [_scalar(one) for one in value]
+    return value
+
+
+class QueryService(object):
+    """ Loaded RVTools files and the calls allowed on them """
+
+    def __init__(self, filenames, **kwargs):
+        """
+        Constructor
+        :param filenames: an iterable of RVTools inventory files
+        :param kwargs: other arguments of PyRvtools
+        """
+        self._files = {}
+        for filename in filenames:
+            name = os.path.basename(filename)
+            if name in self._files:
+                raise PyRvtoolsError('Two files named %s, rename one of '
+                                     'them' % name)
+            rvtools = PyRvtools(filename, **kwargs)
+            for sheet_name, sheet in rvtools.inventory.sheets().items():
+                for column in KEYS.get(sheet_name, ()):
+                    if column in sheet.columns:
+                        sheet.index(column)
+            self._files[name] = rvtools
+        if not self._files:
+            raise PyRvtoolsError('No RVTools file to serve')
+
+    def _rvtools(self, name=None):
+        if name is None:
+            return next(iter(self._files.values()))
+        try:
+            return self._files[name]
+        except KeyError:
+            raise PyRvtoolsError('Unknown file: %s' % name)
+
+    def call(self, method: str, args=(), kwargs=None, file=None):
+        """
+        Run one call and return its result in JSON types
+        :param method: Name of the method (see METHODS and EXTRA_METHODS)
+        :param args: positional arguments
+        :param kwargs: keyword arguments
+        :param file: base name of the RVTools file (default: the first one)
+        """
+        kwargs = kwargs or {}
+        if method == 'files':
+            return list(self._files)
+
+        rvtools = self._rvtools(file)
+        if method in METHODS:
+            return to_json(getattr(rvtools, method)(*args, **kwargs))
+
+        if method == 'properties':
+            kind, name, properties = args
+            found = getattr(rvtools, LOOKUPS[kind])(name)
+            for prop in properties:
+                if not isinstance(getattr(type(found), prop, None),
+                                  property):
+                    raise PyRvtoolsError('Unknown property of %s: %s' %
+                                         (kind, prop))
+            return {prop: to_json(getattr(found, prop))
+                    for prop in properties}
+
+        if method == 'where':
+            kind, = args
+            query = getattr(rvtools, QUERIES[kind]).where(**kwargs)
+            return query.names()
+
+        if method == 'search':
+            how, text = args
+            if how not in SEARCHES:
+                raise PyRvtoolsError('Unknown search: %s' % how)
+            if 'kinds' in kwargs:
+                kwargs['kinds'] = [KINDS[kind] for kind in kwargs['kinds']]
+            found = getattr(rvtools.names, how)(text, **kwargs)
+            if how == 'fuzzy':
+                return [[to_json(one), score] for one, score in found]
+            return to_json(found)
+
+        if method == 'network':
+            how, value = args
+            if how not in NETWORK_SEARCHES:
+                raise PyRvtoolsError('Unknown network search: %s' % how)
+            return to_json(getattr(rvtools.network, how)(value))
+
+        raise PyRvtoolsError('Unknown method: %s' % method)
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    """ POST / with {"method", "args", "kwargs", "file"} """
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length).decode())
+            answer = {'result': self.server.service.call(
+                request['method'], request.get('args', ()),
+                request.get('kwargs'), request.get('file'))}
+            body = json.dumps(answer).encode()
+            status = 200
+        except (PyRvtoolsError, errors.FileNonConformantError,
+                errors.ObjectNotFoundError) as error:
+            answer = {'error': error.__class__.__name__,
+                      'message': str(error)}
+            body = json.dumps(answer).encode()
+            status = 400
+        except (AttributeError, IndexError, KeyError, TypeError, ValueError,
+                re.error) as error:
+            answer = {'error': 'PyRvtoolsError',
+                      'message': 'Bad request: %r' % error}
+            body = json.dumps(answer).encode()
+            status = 400
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        # Unix sockets have no client address
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def log_message(self, *_):
+        pass
+
+
+class QueryHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class UnixQueryHTTPServer(socketserver.ThreadingMixIn,
+                          socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(service: QueryService, port=8765, unix_socket=None):
+    """
+    Return the HTTP server of a QueryService (call serve_forever on it)
+    :param service: the QueryService
+    :param port: TCP port on 127.0.0.1
+    :param unix_socket: path of a Unix socket (used instead of the port)
+    """
+    if unix_socket:
+        # a socket left by a previous server is replaced, not another file
+        if os.path.exists(unix_socket):
+            if not stat.S_ISSOCK(os.stat(unix_socket).st_mode):
+                raise PyRvtoolsError('Not a socket: %s' % unix_socket)
+            os.unlink(unix_socket)
+        server = UnixQueryHTTPServer(unix_socket, RequestHandler)
+    else:
+        server = QueryHTTPServer(('127.0.0.1', port), RequestHandler)
+    server.service = service
+    return server
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+
+    def __init__(self, path: str, timeout=None):
+        super().__init__('localhost', timeout=timeout)
+        self._path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self._path)
+
+
+class Client(object):
+    """
+    Client of the query server, with the method names of PyRvtools (the
+    objects are returned as dictionaries of their fields)
+    """
+
+    def __init__(self, port=8765, unix_socket=None, file=None, timeout=60):
+        """
+        Constructor
+        :param port: TCP port of the server on 127.0.0.1
+        :param unix_socket: path of the Unix socket of the server
+        :param file: base name of the RVTools file (default: the first one)
+        :param timeout: timeout of a call in seconds
+        """
+        self._port = port
+        self._unix_socket = unix_socket
+        self._file = file
+        self._timeout = timeout
+
+    def __getattr__(self, method):
+        if method not in METHODS:
+            raise AttributeError(method)
+
+        def call(*args, **kwargs):
+            return self.call(method, *args, **kwargs)
+        call.__name__ = method
+        return call
+
+    def call(self, method: str, *args, **kwargs):
+        """
+        Send one call to the server and return its result
+        :param method: Name of the method (see METHODS and EXTRA_METHODS)
+        """
+        if self._unix_socket:
+            connection = _UnixHTTPConnection(self._unix_socket, self._timeout)
+        else:
+            connection = http.client.HTTPConnection(
+                '127.0.0.1', self._port, timeout=self._timeout)
+        body = json.dumps({'method': method, 'args': args, 'kwargs': kwargs,
+                           'file': self._file})
+        try:
+            connection.request('POST', '/', body=body,
+                               headers={'Content-Type': 'application/json'})
+            answer = json.loads(connection.getresponse().read().decode())
+        finally:
+            connection.close()
+
+        if 'error' in answer:
+            error = getattr(errors, answer['error'], PyRvtoolsError)
+            raise error(answer['message'])
+        return answer['result']
+
+    def files(self):
+        """ Return the base names of the files loaded by the server """
+        return self.call('files')
+
+    def properties(self, kind: str, name: str, *properties):
+        """
+        Return some properties of one object (ex: 'VirtualMachine',
+        'my_vm', 'vmdk', 'vnetwork')
+        :return dict: a dictionary with PROPERTY:VALUE
+        """
+        return self.call('properties', kind, name, properties)
+
+    def where(self, kind: str, **predicates):
+        """
+        Return the names of the objects matching some predicates (see
+        Query.where), ex: where('VirtualMachine', cpu__gt=8)
+        """
+        return self.call('where', kind, **predicates)
+
+    def search(self, how: str, text: str, **kwargs):
+        """
+        Search objects by name (see NameIndex)
+        :param how: 'prefix', 'glob', 'regex' or 'fuzzy'
+        """
+        return self.call('search', how, text, **kwargs)
+
+    def network(self, how: str, value: str):
+        """
+        Search network adapters (see NetworkIndex)
+        :param how: 'by_ip', 'by_mac', 'in_subnet', 'on_network' or
+                    'on_switch'
+        """
+        return self.call('network', how, value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('files', nargs='+', help='RVTools files')
+    parser.add_argument('--port', type=int, default=8765,
+                        help='TCP port on 127.0.0.1')
+    parser.add_argument('--socket', help='path of a Unix socket')
+    parser.add_argument('--cache-dir', help='cache of parsed inventories')
+    args = parser.parse_args()
+
+    service = QueryService(args.files, cache_dir=args.cache_dir)
+    server = make_server(service, port=args.port, unix_socket=args.socket)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
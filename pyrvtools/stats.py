@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# coding : utf-8
+
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+# Counters kept by Stats, the keys of each counter are given between
+# brackets (column keys are 'SHEET.COLUMN')
+METRICS = (
+    'sheet_loads',      # sheets parsed [sheet]
+    'load_seconds',     # time spent parsing them [sheet]
+    'sheet_unloads',    # sheets unloaded to free memory [sheet]
+    'scans',            # whole columns read [column]
+    'cells',            # cells read, one by one or by scans [column]
+    'index_builds',     # hash indexes built [column]
+    'index_hits',       # searches finding at least one row [column]
+    'index_misses',     # searches finding nothing [column]
+    'objects_created',  # ESX and row objects (VDisk...) created [class]
+    'objects_reused',   # ESX objects found in the identity map [class]
+    'properties',       # values read by ESX objects [CLASS.COLUMN]
+)
+
+
+class Stats(object):
+    """
+    Counters and timers of the work done on an inventory (see METRICS).
+    Nothing is counted unless a Stats is attached to the Inventory, the
+    hooks are called with (metric, key, amount) on every event
+    """
+
+    def __init__(self, hooks=()):
+        """
+        Constructor
+        :param hooks: an iterable of callables (metric, key, amount)
+        """
+        self._counters = {metric: Counter() for metric in METRICS}
+        self._hooks = list(hooks)
+
+    def add_hook(self, hook):
+        """
+        Call a function on every event
+        :param hook: a callable (metric, key, amount)
+        """
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook):
+        """
+        Stop calling a function added with add_hook
+        :param hook: the callable
+        """
+        self._hooks.remove(hook)
+
+    def count(self, metric: str, key: str, amount=1):
+        """
+        Add an amount to one counter
+        :param metric: Name of the metric (see METRICS)
+        :param key: sheet, column or class name
+        :param amount: value to add
+        """
+        self._counters[metric][key] += amount
+        for hook in self._hooks:
+            hook(metric, key, amount)
+
+    @contextmanager
+    def timer(self, metric: str, key: str):
+        """
+        Context manager - add the time spent in a block to a counter
+        :param metric: Name of the metric (ex: 'load_seconds')
+        :param key: sheet, column or class name
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.count(metric, key, time.perf_counter() - start)
+
+    def reset(self):
+        """ Set every counter back to zero """
+        for counter in self._counters.values():
+            counter.clear()
+
+    def snapshot(self):
+        """
+        Return a copy of the counters
+        :return dict: a dictionary with METRIC:{KEY:VALUE}
+        """
+        return {metric: dict(counter)
+                for metric, counter in self._counters.items()}
+
+    def top(self, metric: str, limit=10):
+        """
+        Return the biggest keys of a metric (ex: the most read columns)
+        :param metric: Name of the metric (see METRICS)
+        :param limit: number of keys
+        :return list: a list of (KEY, VALUE)
+        """
+        return self._counters[metric].most_common(limit)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# coding : utf-8
+
+from collections import namedtuple
+from pyrvtools.inventory import Inventory
+from pyrvtools.schema import datastore_name, number, ratio
+
+FIELDS = ('capacity_mb', 'free_mb', 'vms', 'disks', 'provisioned_mb',
+          'thin_disks', 'thin_mb', 'thick_disks', 'thick_mb',
+          'eager_zeroed_disks')
+(CAPACITY, FREE, VMS, DISKS, PROVISIONED, THIN_DISKS, THIN, THICK_DISKS, THICK,
+ EAGER_ZEROED) = range(len(FIELDS))
+
+
+class DatastoreUsage(namedtuple('DatastoreUsage', FIELDS)):
+    """ Storage figures of a datastore, from its virtual disks """
+
+    __slots__ = ()
+
+    @property
+    def used_mb(self):
+        return self.capacity_mb - self.free_mb
+
+    @property
+    def provisioned_ratio(self):
+        """ Size of the virtual disks / capacity (above 1: overcommitted) """
+        return ratio(self.provisioned_mb, self.capacity_mb)
+
+    @property
+    def thin_ratio(self):
+        """ Size of the thin disks / size of every disk """
+        return ratio(self.thin_mb, self.provisioned_mb)
+
+    @property
+    def projected_fill_ratio(self):
+        """
+        Used space / capacity once every thin disk is full (the thick disks
+        are already allocated)
+        """
+        return ratio(max(self.used_mb, self.provisioned_mb),
+                      self.capacity_mb)
+
+
+def storage_usage(inventory: Inventory):
+    """
+    Compute the storage figures of every datastore in one pass over
+    tabvDisk and tabvDatastore (a disk belongs to the datastore of its
+    path)
+    :param inventory: the Inventory of the RVTools file
+    :return dict: a dictionary with DATASTORE_NAME:DatastoreUsage
+    """
+    totals = {}
+    vms = {}
+
+    def new_totals():
+        return [0] * len(FIELDS)
+
+    datastores = inventory.sheet('tabvDatastore')
+    for name, capacity, free in zip(datastores.column('Name'),
+                                    datastores.column('Capacity MB'),
+                                    datastores.column('Free MB')):
+        values = totals.setdefault(name, new_totals())
+        values[CAPACITY] += number(capacity)
+        values[FREE] += number(free)
+
+    disks = inventory.sheet('tabvDisk')
+    for vm, path, capacity, thin, eager in zip(
+            disks.column('VM'), disks.column('Path'),
+            disks.column('Capacity MB'), disks.column('Thin'),
+            disks.column('Eagerly Scrub')):
+        name = datastore_name(path)
+        values = totals.get(name)
+        if values is None:
+            values = totals[name] = new_totals()
+        vms.setdefault(name, set()).add(vm)
+        size = number(capacity)
+        values[DISKS] += 1
+        values[PROVISIONED] += size
+        if thin:
+            values[THIN_DISKS] += 1
+            values[THIN] += size
+        else:
+            values[THICK_DISKS] += 1
+            values[THICK] += size
+            if eager:
+                values[EAGER_ZEROED] += 1
+
+    for name, values in totals.items():
+        values[VMS] = len(vms.get(name, ()))
+    return {name: DatastoreUsage(*values) for name, values in totals.items()}
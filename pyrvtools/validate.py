@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# coding : utf-8
+
+from pyrvtools.errors import FileNonConformantError
+from pyrvtools.schema import ALIASES, SHEETS
+
+# Tabs every RVTools file must have (tabvNetwork is missing from some old
+# exports, it is only checked when present)
+REQUIRED_TABS = ('tabvInfo', 'tabvDisk', 'tabvPartition', 'tabvHost',
+                 'tabvHBA', 'tabvDatastore')
+
+# Columns that may be missing without breaking any object
+OPTIONAL_COLUMNS = ('VI SDK Server',)
+
+# Columns each class depends on, by tab (None: every column of SHEETS)
+DEPENDENCIES = {
+    'Cluster': {'tabvHost': ('Cluster', 'Datacenter', 'Host')},
+    'DataCenter': {'tabvHost': ('Datacenter', 'Cluster', 'Host')},
+    'DataStore': {'tabvDatastore': None, 'tabvInfo': ('VM', 'Path'),
+                  'tabvDisk': ('VM', 'Path')},
+    'HBA': {'tabvHBA': None},
+    'Host': {'tabvHost': None, 'tabvHBA': ('Host',),
+             'tabvDatastore': ('Name', 'Hosts'), 'tabvInfo': ('VM', 'Host')},
+    'VDisk': {'tabvDisk': None},
+    'VNetwork': {'tabvNetwork': None},
+    'VPartition': {'tabvPartition': None},
+    'VirtualMachine': {'tabvInfo': None, 'tabvDisk': ('VM', 'Path'),
+                       'tabvNetwork': ('VM',), 'tabvPartition': ('VM',)},
+}
+
+
+def required_columns(tab: str):
+    """
+    Return the columns of a tab needed by the ESX objects
+    :param tab: Name of the tab
+    :return dict: a dictionary with COLUMN_NAME:[CLASS NAMES]
+    """
+    required = {}
+    for cls, tabs in sorted(DEPENDENCIES.items()):
+        if tab not in tabs:
+            continue
+        columns = tabs[tab] if tabs[tab] is not None else SHEETS[tab]
+        for column in columns:
+            if column not in OPTIONAL_COLUMNS:
+                required.setdefault(column, []).append(cls)
+    return required
+
+
+def column_problems(tab: str, header):
+    """
+    Return the description of the columns missing from a tab
+    :param tab: Name of the tab
+    :param header: names of the columns of the tab
+    :return list: a list of messages (empty if the tab is complete)
+    """
+    aliases = ALIASES.get(tab, {})
+    header = {aliases.get(column, column) for column in header}
+    problems = []
+    for column, classes in required_columns(tab).items():
+        if column not in header:
+            problems.append('%s: missing column %r (needed by %s)' %
+                            (tab, column, ', '.join(classes)))
+    return problems
+
+
+def _report(filename: str, problems: list):
+    return 'Not a conformant RVTools file: %s\n  - %s' % (
+        filename, '\n  - '.join(problems))
+
+
+def check_columns(filename: str, tab: str, header):
+    """
+    Raise a FileNonConformantError if some needed columns of a tab are
+    missing
+    :param filename: Name of the RVTools file (used in the report)
+    :param tab: Name of the tab
+    :param header: names of the columns of the tab
+    """
+    problems = column_problems(tab, header)
+    if problems:
+        raise FileNonConformantError(_report(filename, problems))
+
+
+def validate(reader):
+    """
+    Check the tabs and the header rows of a workbook, without reading the
+    sheets. Raise one FileNonConformantError listing every problem
+    :param reader: the Reader of the RVTools file
+    :return list: the tabs whose header row the reader could not read
+                  without parsing the whole sheet (to check on load)
+    """
+    names = set(reader.sheet_names())
+    problems = []
+    for tab in REQUIRED_TABS:
+        if tab not in names:
+            classes = sorted(cls for cls, tabs in DEPENDENCIES.items()
+                             if tab in tabs)
+            problems.append('missing tab %s (needed by %s)' %
+                            (tab, ', '.join(classes)))
+
+    unchecked = []
+    for tab in SHEETS:
+        if tab not in names:
+            continue
+        header = reader.read_header(tab)
+        if header is None:
+            unchecked.append(tab)
+        else:
+            problems.extend(column_problems(tab, header))
+
+    if problems:
+        raise FileNonConformantError(_report(reader.filename, problems))
+    return unchecked
@@ -9,20 +9,23 @@ setup(
     version='1.0.1',
     packages=['pyrvtools'],
     install_requires=['xlrd'],
+    extras_require={'arrow': ['pyarrow']},
     url='https://github.com/jbrt/pyrvtools',
     license='GPL',
     author='Julien B.',
     author_email='julien@toshokan.fr',
     description='Extract useful information from an RVTools ESX inventory file',
     long_description=readme(),
+    python_requires='>=3.6',
     classifiers=[
         "Development Status :: 5 - Production/Stable",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.1",
-        "Programming Language :: Python :: 3.2",
-        "Programming Language :: Python :: 3.3",
-        "Programming Language :: Python :: 3.4",
-        "Programming Language :: Python :: 3.5",
+        "Programming Language :: Python :: 3.6",
+        "Programming Language :: Python :: 3.7",
+        "Programming Language :: Python :: 3.8",
+        "Programming Language :: Python :: 3.9",
+        "Programming Language :: Python :: 3.10",
+        "Programming Language :: Python :: 3.11",
         "Topic :: Utilities",
         "License :: OSI Approved :: GNU General Public License v3 (GPLv3)",
     ],
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# coding : utf-8
+
+import unittest
+from pyrvtools.esx_types import DataStore, VirtualMachine
+from pyrvtools.inventory import Inventory
+from pyrvtools.query import Query
+from pyrvtools.readers import MemoryReader
+
+SHEETS = {
+    'tabvInfo': {
+        'VM': ['vm1', 'vm2', 'vm3', 'vm4'],
+        'Powerstate': ['poweredOn', 'poweredOn', 'poweredOff', 'poweredOn'],
+        'CPUs': [2.0, '', 4.0, 8.0],
+        'OS': ['Linux', 'Windows', 'Linux', 'Windows'],
+    },
+    'tabvDatastore': {
+        'Name': ['ds1', 'ds2', 'ds3'],
+        'Type': ['VMFS', 'VMFS', 'NFS'],
+        'Address': ['naa.600a', 'naa.600b', 'nfs01:/export'],
+        'Hosts': ['esx1, esx2', 'esx2', 'unknown'],
+        'Major Version': [6.0, 5.0, ''],
+    },
+}
+
+
+class TestQuery(unittest.TestCase):
+
+    def setUp(self):
+        reader = MemoryReader('rvtools.xlsx', SHEETS)
+        self.inventory = Inventory(reader)
+
+    def names(self, cls, *predicates):
+        """ Names matching the predicates, given in that order """
+        query = Query(self.inventory, cls)
+        for expression, value in predicates:
+            query = query.where(**{expression: value})
+        return sorted(query.names())
+
+    def assertAnyOrder(self, cls, expected, *predicates):
+        """ Same result whatever the order of the predicates """
+        self.assertEqual(self.names(cls, *predicates), expected)
+        self.assertEqual(self.names(cls, *reversed(predicates)), expected)
+
+    def test_blank_numeric_cell(self):
+        self.assertEqual(self.names(VirtualMachine, ('cpu__gt', 3)),
+                         ['vm3', 'vm4'])
+        self.assertEqual(self.names(VirtualMachine, ('cpu__ne', 2)),
+                         ['vm3', 'vm4'])
+
+    def test_numeric_equality(self):
+        self.assertAnyOrder(VirtualMachine, ['vm4'], ('cpu', 8),
+                            ('power_state', 'poweredOn'))
+
+    def test_list_equality(self):
+        self.assertEqual(self.names(DataStore, ('hosts', ['esx2'])),
+                         ['ds2'])
+        self.assertAnyOrder(DataStore, ['ds1'], ('type', 'VMFS'),
+                            ('hosts', ['esx1', 'esx2']))
+
+    def test_list_contains(self):
+        self.assertAnyOrder(DataStore, ['ds1', 'ds2'], ('type', 'VMFS'),
+                            ('hosts__contains', 'esx2'))
+        self.assertEqual(self.names(DataStore, ('hosts__contains',
+                                                'unknown')), [])
+
+    def test_converted_properties(self):
+        ds1 = self.inventory.get(DataStore, 'ds1')
+        self.assertAnyOrder(DataStore, ['ds1'], ('naa', ds1.naa),
+                            ('type', 'VMFS'))
+        self.assertAnyOrder(DataStore, ['ds1'], ('version', ds1.version),
+                            ('name', 'ds1'))
+
+    def test_index_and_scan_agree(self):
+        self.assertAnyOrder(VirtualMachine, ['vm2', 'vm4'],
+                            ('power_state', 'poweredOn'),
+                            ('os', 'Windows'))
+
+
+if __name__ == '__main__':
+    unittest.main()